@@ -31,6 +31,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'sgeaweb.papeis.PapelMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -49,6 +50,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'sgeaweb.papeis.context_processor',
             ],
         },
     },
@@ -77,15 +79,17 @@ AUTH_PASSWORD_VALIDATORS = [
 # DRF: auth + throttling (nomes de escopo batem com os que usaremos nas views)
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "sgeaweb.api.authentication.CachedTokenAuthentication",  # token + usuário + perfil em cache
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
+        "sgeaweb.api.throttling.BaldeThrottle",  # balde de fichas compartilhado entre workers
     ],
     "DEFAULT_THROTTLE_RATES": {
         "eventos_list": "20/day",
+        "eventos_changes": "2000/day",  # feed incremental: barato, pensado para polling
         "inscricoes_create": "50/day",
+        "certificados_verificar": "600/hour",
     },
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
@@ -109,6 +113,9 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Auth: usuário da sessão carregado junto com o perfil (sgeaweb/papeis.py)
+AUTHENTICATION_BACKENDS = ["sgeaweb.papeis.BackendComPerfil"]
+
 # Auth redirects
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "home"
@@ -117,3 +124,42 @@ LOGOUT_REDIRECT_URL = "home"
 # E-mail
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "naoresponda@sgea.com"
+# Caixa de saída (sgeaweb/caixa_saida.py), entregue pelo comando `enviar_emails`
+EMAIL_SAIDA_LOTE = 100        # e-mails por lote (uma conexão SMTP por lote)
+EMAIL_SAIDA_TENTATIVAS = 5    # depois disso o e-mail fica como FALHOU
+EMAIL_SAIDA_ESPERA = 30       # s; dobra a cada falha (máx. 1 h)
+EMAIL_SAIDA_RESERVA = 300     # s; reserva de um worker que morreu expira e o e-mail volta à fila
+
+# Auditoria (Item 10): gravação em lote por thread em segundo plano (sgeaweb/auditoria.py)
+AUDITORIA_ASSINCRONA = True
+AUDITORIA_LOTE = 200          # grava quando a fila atinge N registros...
+AUDITORIA_INTERVALO = 2.0     # ...ou a cada N segundos
+AUDITORIA_FILA_MAX = 10_000   # acima disso, registros não duráveis são descartados (e contados)
+# Leituras frequentes: um registro agregado por (usuário, ação, janela de AUDITORIA_JANELA segundos)
+AUDITORIA_ACOES_AGREGADAS = ("API_CONSULTA_EVENTOS", "CONSULTAR_CERTIFICADO")
+AUDITORIA_JANELA = 60
+AUDITORIA_RETENCAO_DIAS = 180                       # mais antigos vão para o arquivo (arquivar_auditoria)
+AUDITORIA_ARQUIVO_DIR = BASE_DIR / "auditoria_arquivo"  # um .jsonl.gz por mês
+
+# Throttling da API: baldes de fichas num SQLite (WAL) compartilhado pelos workers do host
+API_THROTTLE_DB = BASE_DIR / "throttle.sqlite3"
+
+# Cache padrão: locmem (um por processo). "compartilhado" (sgeaweb/cache_compartilhado.py) guarda em arquivos
+# o que todos os workers precisam ver invalidado na hora (tokens da API, versões das páginas), fora do banco
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "compartilhado": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache_compartilhado",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10_000},
+    },
+}
+
+# Autenticação por token da API: validade da entrada em cache (s)
+API_TOKEN_CACHE_TTL = 60
+
+# Cache da home e do detalhe do evento (sgeaweb/cache_paginas.py); invalidado por versão via signals
+PAGINAS_CACHE_TTL = 300
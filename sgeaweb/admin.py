@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import TipoEvento, PerfilUsuario, Evento, Inscricao, Certificado, Auditoria
+from .models import TipoEvento, PerfilUsuario, Evento, Inscricao, Certificado, Auditoria, EmailSaida
+from .busca import buscar
 
 @admin.register(TipoEvento)
 class TipoEventoAdmin(admin.ModelAdmin):
@@ -19,12 +20,22 @@ class EventoAdmin(admin.ModelAdmin):
     search_fields = ("titulo", "local")
     autocomplete_fields = ("organizador", "responsavel")
 
+    def get_search_results(self, request, queryset, search_term):
+        # Usa o índice FTS5 (sgeaweb/busca.py) em vez de icontains em cada coluna
+        if not search_term.strip():
+            return queryset, False
+        return buscar(queryset, search_term), False
+
 @admin.register(Inscricao)
 class InscricaoAdmin(admin.ModelAdmin):
     list_display = ("id", "participante", "evento", "presenca_confirmada", "criado_em")
     list_filter = ("presenca_confirmada", "criado_em")
     search_fields = ("participante__username", "evento__titulo")
 
+    def get_readonly_fields(self, request, obj=None):
+        # Trocar o evento de uma inscrição existente deixaria o contador de vagas dos dois eventos errado
+        return ("participante", "evento") if obj else ()
+
 @admin.register(Certificado)
 class CertificadoAdmin(admin.ModelAdmin):
     list_display = ("inscricao", "codigo_validacao", "emitido_em")
@@ -33,5 +44,13 @@ class CertificadoAdmin(admin.ModelAdmin):
 @admin.register(Auditoria)
 class AuditoriaAdmin(admin.ModelAdmin):
     list_display = ("id", "usuario", "acao", "data_hora")
+    ordering = ("-data_hora",)
     list_filter = ("acao", "data_hora")
     search_fields = ("usuario__username", "acao", "descricao")
+
+@admin.register(EmailSaida)
+class EmailSaidaAdmin(admin.ModelAdmin):
+    list_display = ("id", "assunto", "destinatarios", "status", "tentativas", "proxima_tentativa", "enviado_em")
+    list_filter = ("status",)
+    search_fields = ("assunto",)
+    readonly_fields = ("lote", "reservado_ate", "criado_em", "enviado_em", "erro")
@@ -0,0 +1,61 @@
+"""Autenticação por token com cache.
+
+O TokenAuthentication do DRF faz um JOIN token+usuário a cada chamada, e as
+permissões (`IsOrganizador`, `IsAlunoOuProfessor`) ainda carregam
+`user.perfil`. Aqui token, usuário e perfil são lidos numa consulta só e
+guardados no cache por API_TOKEN_CACHE_TTL segundos; num acerto a
+requisição não consulta o banco para autenticar.
+
+Os signals (sgeaweb/signals.py) removem a entrada quando o token é
+excluído ou quando usuário/perfil mudam (ex.: desativação, troca de perfil).
+A entrada fica no cache "compartilhado" (arquivos, visto por todos os
+workers, sem tocar no banco), então a remoção vale para todos; em qualquer
+caso, uma entrada velha dura no máximo API_TOKEN_CACHE_TTL segundos.
+"""
+import hashlib
+
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from sgeaweb import cache_compartilhado
+
+PREFIXO = "api_token:"
+
+
+def _chave(key):
+    # O token em si não vai para a chave do cache (backends em arquivo, logs de memcached...)
+    return PREFIXO + hashlib.sha256(key.encode()).hexdigest()
+
+
+def esquecer_token(key):
+    cache_compartilhado.cache().delete(_chave(key))
+
+
+def esquecer_usuario(user_id):
+    """Remove do cache o(s) token(s) do usuário."""
+    chaves = [_chave(key) for key in Token.objects.filter(user_id=user_id).values_list("key", flat=True)]
+    if chaves:
+        cache_compartilhado.cache().delete_many(chaves)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication com token, usuário e perfil em cache de curta duração."""
+
+    def authenticate_credentials(self, key):
+        chave = _chave(key)
+        cache = cache_compartilhado.cache()
+        guardado = cache.get(chave)
+        if guardado is None:
+            try:
+                token = Token.objects.select_related("user__perfil").get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed("Token inválido.")
+            guardado = (token.user, token)
+            cache.set(chave, guardado, getattr(settings, "API_TOKEN_CACHE_TTL", 60))
+
+        user, token = guardado
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("Usuário inativo ou excluído.")
+        return user, token
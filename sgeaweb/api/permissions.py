@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from sgeaweb.papeis import papel
+
 
 class IsOrganizador(BasePermission):
     """
@@ -7,14 +9,7 @@ class IsOrganizador(BasePermission):
     """
 
     def has_permission(self, request, view):
-        user = request.user
-        if not user or not user.is_authenticated:
-            return False
-
-        try:
-            return user.perfil.perfil == "ORGANIZADOR"
-        except Exception:
-            return False
+        return papel(request.user).organizador
 
 
 class IsAlunoOuProfessor(BasePermission):
@@ -23,14 +18,7 @@ class IsAlunoOuProfessor(BasePermission):
     """
 
     def has_permission(self, request, view):
-        user = request.user
-        if not user or not user.is_authenticated:
-            return False
-
-        try:
-            return user.perfil.perfil in ["ALUNO", "PROFESSOR"]
-        except Exception:
-            return False
+        return papel(request.user).participante
 
 
 class IsOwnerOrReadOnly(BasePermission):
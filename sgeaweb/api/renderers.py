@@ -0,0 +1,65 @@
+"""Renderizadores alternativos da API de eventos.
+
+- OrjsonRenderer: mesmo JSON do JSONRenderer do DRF, gerado pelo orjson
+  (bem mais rápido em listas grandes). Sem orjson instalado, a API segue
+  com o JSONRenderer padrão.
+- MessagePackRenderer: `Accept: application/msgpack` (ou ?format=msgpack),
+  para clientes que preferem binário compacto. Só é oferecido se o pacote
+  `msgpack` estiver instalado.
+"""
+from decimal import Decimal
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # dependência opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # dependência opcional
+    msgpack = None
+
+
+def _converter(valor):
+    # Tipos que o DRF entrega e que orjson/msgpack não conhecem
+    if isinstance(valor, Promise):
+        return force_str(valor)
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+class OrjsonRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_converter, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_converter, use_bin_type=True)
+
+
+def renderizadores_eventos():
+    """JSON (orjson, se houver) primeiro; MessagePack se instalado; navegável por último."""
+    classes = [OrjsonRenderer if orjson is not None else JSONRenderer]
+    if msgpack is not None:
+        classes.append(MessagePackRenderer)
+    classes.append(BrowsableAPIRenderer)
+    return classes
@@ -1,6 +1,9 @@
+from django.conf import settings
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
-from django.utils import timezone
 from sgeaweb.models import Evento, Inscricao, TipoEvento
+from sgeaweb.reservas import reservar_vaga, InscricaoRecusada
+from sgeaweb.verificacao import LOTE_MAXIMO
 
 
 class TipoEventoSerializer(serializers.ModelSerializer):
@@ -72,9 +75,119 @@ class InscricaoSerializer(serializers.ModelSerializer):
 
 
 class EventoListSerializer(EventoSerializer):
+    """
+    Aceita `campos` no contexto (?fields=id,titulo,data_inicio) para devolver só parte da resposta.
+    """
+    # Colunas que cada campo lê: a view usa isto para podar também o SELECT (.only)
+    COLUNAS = {
+        "id": ["id"],
+        "tipo_nome": ["TIPO__nome"],
+        "titulo": ["titulo"],
+        "descricao": ["descricao"],
+        "data_inicio": ["data_inicio"],
+        "data_fim": ["data_fim"],
+        "horario": ["horario"],
+        "local": ["local"],
+        "vagas": ["vagas"],
+        "organizador": ["organizador__username"],
+        "responsavel_nome": ["responsavel__first_name", "responsavel__last_name", "responsavel__username"],
+        "banner_url": ["banner"],
+    }
+    RELACOES = {"tipo_nome": "TIPO", "organizador": "organizador", "responsavel_nome": "responsavel"}
+
     class Meta(EventoSerializer.Meta):
         pass
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        campos = self.context.get("campos")
+        if campos:
+            for nome in set(self.fields) - set(campos):
+                self.fields.pop(nome)
+
+    @classmethod
+    def campos_validos(cls):
+        return list(cls.COLUNAS)
+
+    @classmethod
+    def linhas(cls, qs, campos=None, request=None):
+        """Caminho rápido, só leitura: (queryset de dicts, função que monta cada item da resposta).
+
+        Lê com `.values()` apenas as colunas dos campos pedidos e monta os
+        itens sem a maquinaria de campos do DRF; a saída é igual à do
+        serializer. O prefixo da URL do banner é calculado uma vez.
+        """
+        campos = campos or cls.campos_validos()
+        colunas = {"id", "data_inicio"}  # usadas pelo cursor da paginação
+        for c in campos:
+            colunas.update(cls.COLUNAS[c])
+        prefixo_midia = request.build_absolute_uri(settings.MEDIA_URL) if request else settings.MEDIA_URL
+
+        def banner_url(linha):
+            nome = linha["banner"]
+            return f"{prefixo_midia}{filepath_to_uri(nome)}" if nome else None
+
+        def responsavel_nome(linha):
+            nome = f"{linha['responsavel__first_name']} {linha['responsavel__last_name']}".strip()
+            return nome or linha["responsavel__username"]
+
+        def data(valor):
+            return valor.isoformat() if valor else None
+
+        montadores = {
+            "id": lambda l: l["id"],
+            "tipo_nome": lambda l: l["TIPO__nome"],
+            "titulo": lambda l: l["titulo"],
+            "descricao": lambda l: l["descricao"],
+            "data_inicio": lambda l: data(l["data_inicio"]),
+            "data_fim": lambda l: data(l["data_fim"]),
+            "horario": lambda l: l["horario"],
+            "local": lambda l: l["local"],
+            "vagas": lambda l: l["vagas"],
+            "organizador": lambda l: l["organizador__username"],
+            "responsavel_nome": responsavel_nome,
+            "banner_url": banner_url,
+        }
+        # Mantém a ordem de campos do serializer
+        ordem = [(c, montadores[c]) for c in cls.COLUNAS if c in campos]
+
+        def montar(linha):
+            return {nome: montador(linha) for nome, montador in ordem}
+
+        return qs.values(*sorted(colunas)), montar
+
+    @classmethod
+    def podar(cls, qs, campos=None):
+        """Aplica select_related/only conforme os campos pedidos (todos, se `campos` for None)."""
+        campos = campos or cls.campos_validos()
+        relacoes = [cls.RELACOES[c] for c in campos if c in cls.RELACOES]
+        colunas = {"id", "data_inicio"}  # usadas pelo cursor da paginação
+        for c in campos:
+            colunas.update(cls.COLUNAS[c])
+        if relacoes:
+            # Sem argumentos, select_related() seguiria todas as FKs
+            qs = qs.select_related(*relacoes)
+        return qs.only(*sorted(colunas))
+
+
+class EventoFiltroSerializer(serializers.Serializer):
+    """
+    Filtros de GET /api/eventos/ (query string), todos opcionais:
+    ?desde=2025-01-01&ate=2025-12-31&tipo=2&local=auditorio&organizador=1&responsavel=3&com_vagas=1
+    """
+    desde = serializers.DateField(required=False)
+    ate = serializers.DateField(required=False)
+    tipo = serializers.IntegerField(required=False, min_value=1)
+    local = serializers.CharField(required=False, max_length=200)
+    organizador = serializers.IntegerField(required=False, min_value=1)
+    responsavel = serializers.IntegerField(required=False, min_value=1)
+    com_vagas = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if attrs.get("desde") and attrs.get("ate") and attrs["desde"] > attrs["ate"]:
+            raise serializers.ValidationError("'desde' deve ser anterior ou igual a 'ate'.")
+        return attrs
+
 
 class InscricaoCreateSerializer(serializers.Serializer):
     """
@@ -97,17 +210,22 @@ class InscricaoCreateSerializer(serializers.Serializer):
         usuario = request.user
         evento = Evento.objects.get(pk=validated_data["evento_id"])
 
-        # Regras de negócio (mesmas do HTML)
-        if evento.data_fim < timezone.now().date():
-            raise serializers.ValidationError("Este evento já foi encerrado.")
-
-        if usuario == evento.organizador:
-            raise serializers.ValidationError("Organizadores não podem se inscrever no próprio evento.")
-
-        if Inscricao.objects.filter(evento=evento, participante=usuario).exists():
-            raise serializers.ValidationError("Você já está inscrito neste evento.")
+        # Regras de negócio (mesmas do HTML, via motor de reservas)
+        try:
+            return reservar_vaga(evento, usuario)
+        except InscricaoRecusada as e:
+            raise serializers.ValidationError(e.mensagem)
 
-        if Inscricao.objects.filter(evento=evento).count() >= evento.vagas:
-            raise serializers.ValidationError("Não há vagas disponíveis.")
 
-        return Inscricao.objects.create(participante=usuario, evento=evento)
+class VerificacaoLoteSerializer(serializers.Serializer):
+    """
+    POST /api/certificados/verificar/
+    {
+        "codigos": ["AbC123...", "..."]
+    }
+    """
+    codigos = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        allow_empty=False,
+        max_length=LOTE_MAXIMO,
+    )
@@ -0,0 +1,104 @@
+"""Throttling da API com balde de fichas compartilhado entre processos.
+
+O `UserRateThrottle` do DRF guarda a lista de horários de cada usuário no
+cache padrão (locmem, por processo): com N workers o limite real vira N
+vezes o configurado, e cada verificação filtra a lista inteira.
+
+Aqui cada (escopo, usuário) é uma linha num SQLite próprio em modo WAL
+(API_THROTTLE_DB), visto por todos os workers do host. A taxa "20/day" vira
+um balde de 20 fichas que se repõe a 20 por dia; cada requisição consome
+uma ficha numa transação `BEGIN IMMEDIATE` (leitura + escrita de uma linha,
+O(1)), então processos concorrentes nunca gastam a mesma ficha.
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import UserRateThrottle
+
+SQL_CRIAR = """CREATE TABLE IF NOT EXISTS balde (
+    chave TEXT PRIMARY KEY,
+    fichas REAL NOT NULL,
+    atualizado REAL NOT NULL
+) WITHOUT ROWID"""
+
+# Uma limpeza a cada N consumos: baldes cheios equivalem a baldes inexistentes
+LIMPEZA_A_CADA = 1000
+
+_local = threading.local()
+
+
+def _caminho():
+    return str(getattr(settings, "API_THROTTLE_DB", settings.BASE_DIR / "throttle.sqlite3"))
+
+
+def conexao(caminho=None):
+    """Conexão do processo/thread atual (refeita depois de um fork)."""
+    caminho = caminho or _caminho()
+    chave = (os.getpid(), caminho)
+    con = getattr(_local, "conexoes", {}).get(chave)
+    if con is None:
+        con = sqlite3.connect(caminho, timeout=10, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")  # em WAL, seguro contra corrupção; basta para contadores
+        con.execute(SQL_CRIAR)
+        _local.conexoes = {**getattr(_local, "conexoes", {}), chave: con}
+    return con
+
+
+def consumir(chave, capacidade, por_segundo, agora=None, caminho=None):
+    """Tenta gastar uma ficha do balde `chave`.
+
+    Devolve (permitido, espera): `espera` é quanto falta, em segundos, para
+    haver uma ficha (0 quando permitido).
+    """
+    con = conexao(caminho)
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        agora = time.time() if agora is None else agora
+        linha = con.execute("SELECT fichas, atualizado FROM balde WHERE chave = ?", (chave,)).fetchone()
+        if linha is None:
+            fichas = float(capacidade)
+        else:
+            fichas = min(float(capacidade), linha[0] + max(0.0, agora - linha[1]) * por_segundo)
+
+        permitido = fichas >= 1
+        if permitido:
+            fichas -= 1
+        con.execute("INSERT INTO balde(chave, fichas, atualizado) VALUES (?, ?, ?) "
+                    "ON CONFLICT(chave) DO UPDATE SET fichas = excluded.fichas, atualizado = excluded.atualizado",
+                    (chave, fichas, agora))
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+
+    if random.randrange(LIMPEZA_A_CADA) == 0:
+        limpar(caminho)
+    return permitido, (0.0 if permitido else (1 - fichas) / por_segundo)
+
+
+def limpar(caminho=None, agora=None, horizonte=86400 * 7):
+    """Remove baldes sem uso há mais de `horizonte` segundos (já estariam cheios)."""
+    agora = time.time() if agora is None else agora
+    cursor = conexao(caminho).execute("DELETE FROM balde WHERE atualizado < ?", (agora - horizonte,))
+    return cursor.rowcount
+
+
+class BaldeThrottle(UserRateThrottle):
+    """UserRateThrottle (mesmo escopo, taxa e identificação) sobre o balde compartilhado."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        chave = self.get_cache_key(request, view)
+        if chave is None:
+            return True
+        permitido, self.espera = consumir(chave, self.num_requests, self.num_requests / self.duration)
+        return permitido
+
+    def wait(self):
+        return getattr(self, "espera", None)
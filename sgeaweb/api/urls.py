@@ -4,5 +4,7 @@ from . import views
 urlpatterns = [
     path("auth/token/", views.ObtainAuthTokenBrowsable.as_view(), name="api_auth_token"),
     path("eventos/", views.EventoListAPI.as_view(), name="api_eventos"),
+    path("eventos/changes/", views.EventoMudancasAPI.as_view(), name="api_eventos_changes"),
     path("inscricoes/", views.InscricaoCreateAPI.as_view(), name="api_inscricoes"),
+    path("certificados/verificar/", views.CertificadoVerificarAPI.as_view(), name="api_certificados_verificar"),
 ]
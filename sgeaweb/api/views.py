@@ -1,41 +1,203 @@
-from rest_framework import generics, permissions
-from rest_framework.throttling import UserRateThrottle
+import hashlib
+
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.renderers import JSONRenderer, BrowsableAPIRenderer
+from rest_framework.utils.urls import replace_query_param
 
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
-from sgeaweb.models import Evento, Inscricao
-from sgeaweb.views import log_action
-from .serializers import EventoListSerializer, InscricaoCreateSerializer
+from sgeaweb.models import Evento, Inscricao, AcaoAuditoria
+from sgeaweb.auditoria import log_action
+from sgeaweb.busca import buscar
+from sgeaweb.verificacao import verificar
+from sgeaweb.eventos import filtrar, carimbo_colecao, mudancas
+from .serializers import EventoListSerializer, EventoFiltroSerializer, InscricaoCreateSerializer, VerificacaoLoteSerializer
 from .permissions import IsAlunoOuProfessor
+from .renderers import renderizadores_eventos
+from .throttling import BaldeThrottle
 
 
 class ObtainAuthTokenBrowsable(ObtainAuthToken):
     renderer_classes = [JSONRenderer, BrowsableAPIRenderer]
 
 
-class EventoListThrottle(UserRateThrottle):
+class EventoListThrottle(BaldeThrottle):
     scope = "eventos_list"
 
 
-class InscricaoCreateThrottle(UserRateThrottle):
+class InscricaoCreateThrottle(BaldeThrottle):
     scope = "inscricoes_create"
 
 
+class VerificacaoThrottle(BaldeThrottle):
+    scope = "certificados_verificar"
+
+
+class EventoCursorPagination(CursorPagination):
+    # Ordem estável (data_inicio, id): cada página é uma busca pelo índice, sem OFFSET
+    ordering = ("data_inicio", "id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class EventoBuscaPagination(LimitOffsetPagination):
+    """Resultados da busca (?q=), na ordem de relevância, que o cursor em (data_inicio, id) desfaria.
+
+    Paginados por offset com o mesmo envelope do cursor (next/previous/results)
+    e o mesmo `page_size`; lê uma linha a mais para saber se há próxima página,
+    sem COUNT.
+    """
+    default_limit = EventoCursorPagination.page_size
+    limit_query_param = "page_size"
+    max_limit = EventoCursorPagination.max_page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        linhas = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.tem_proxima = len(linhas) > self.limit
+        return linhas[:self.limit]
+
+    def get_next_link(self):
+        if not self.tem_proxima:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+
+
 class EventoListAPI(generics.ListAPIView):
-    queryset = Evento.objects.all().order_by("data_inicio")
+    """
+    GET /api/eventos/?fields=id,titulo,data_inicio&cursor=...
+    Paginada por cursor; com ?q= a paginação é por offset, na ordem de relevância.
+    """
+    queryset = Evento.objects.all().order_by("data_inicio", "id")
     serializer_class = EventoListSerializer
+    pagination_class = EventoCursorPagination
+    renderer_classes = renderizadores_eventos()
     permission_classes = [permissions.IsAuthenticated]
     throttle_classes = [EventoListThrottle]
 
+    def campos(self):
+        bruto = self.request.query_params.get("fields", "").strip()
+        if not bruto:
+            return None
+        campos = [c.strip() for c in bruto.split(",") if c.strip()]
+        invalidos = sorted(set(campos) - set(EventoListSerializer.campos_validos()))
+        if invalidos:
+            raise ValidationError({"fields": f"Campos inválidos: {', '.join(invalidos)}."})
+        return campos
+
+    def get_serializer_context(self):
+        contexto = super().get_serializer_context()
+        contexto["campos"] = self.campos()
+        return contexto
+
+    def filtrados(self):
+        filtros = EventoFiltroSerializer(data=self.request.query_params)
+        filtros.is_valid(raise_exception=True)
+        qs = filtrar(super().get_queryset(), **filtros.validated_data)
+
+        q = self.request.query_params.get("q", "").strip()
+        if q:
+            # Busca textual (FTS5), ordenada por relevância
+            qs = buscar(qs, q)
+        return qs
+
+    def get_queryset(self):
+        return EventoListSerializer.podar(self.filtrados(), self.campos())
+
+    def carimbo(self):
+        """(ETag, Last-Modified) da resposta, sem rodar a consulta principal."""
+        if not hasattr(self, "_carimbo"):
+            ultimo, versao = carimbo_colecao()
+            # A mesma coleção rende respostas diferentes conforme filtros, campos, cursor e formato
+            bruto = (f"{ultimo.isoformat() if ultimo else '-'}|{versao}|{self.request.get_full_path()}"
+                     f"|{self.request.META.get('HTTP_ACCEPT', '')}")
+            self._carimbo = (f'"{hashlib.md5(bruto.encode()).hexdigest()}"', ultimo)
+        return self._carimbo
+
+    def nao_modificado(self, request):
+        etag, ultimo = self.carimbo()
+        return get_conditional_response(request, etag=etag,
+                                        last_modified=int(ultimo.timestamp()) if ultimo else None)
+
+    def check_throttles(self, request):
+        # Polling sem mudança (304) não gasta a cota diária
+        if request.method in ("GET", "HEAD") and self.nao_modificado(request) is not None:
+            return
+        super().check_throttles(request)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            busca = self.request.query_params.get("q", "").strip()
+            self._paginator = EventoBuscaPagination() if busca else self.pagination_class()
+        return self._paginator
+
     def list(self, request, *args, **kwargs):
-        resp = super().list(request, *args, **kwargs)
-        log_action(request.user, "API_CONSULTA_EVENTOS",
-                   f"Listagem via API em {timezone.now().isoformat()}.")
+        resp = self.nao_modificado(request)
+        if resp is None:
+            # Caminho rápido: dicts de .values(), sem instanciar modelos nem campos do serializer
+            linhas, montar = EventoListSerializer.linhas(self.filtrados(), self.campos(), request)
+            pagina = self.paginate_queryset(linhas)
+            if pagina is not None:
+                resp = self.get_paginated_response([montar(linha) for linha in pagina])
+            else:
+                resp = Response([montar(linha) for linha in linhas])
+        etag, ultimo = self.carimbo()
+        resp["ETag"] = etag
+        if ultimo:
+            resp["Last-Modified"] = http_date(ultimo.timestamp())
+        log_action(request.user, AcaoAuditoria.API_CONSULTA_EVENTOS,
+                   f"Listagem via API em {timezone.now().isoformat()} (HTTP {resp.status_code}).")
         return resp
 
 
+class EventoMudancasThrottle(BaldeThrottle):
+    scope = "eventos_changes"
+
+
+class EventoMudancasAPI(generics.GenericAPIView):
+    """
+    Feed incremental para clientes que espelham o catálogo.
+    GET /api/eventos/changes/              -> sincronização inicial (em páginas)
+    GET /api/eventos/changes/?since=CURSOR -> só o que mudou depois do cursor
+    Resposta: {"eventos": [...], "removidos": [ids], "cursor": "...", "mais": bool}
+    Com "mais": true, chame de novo imediatamente com o cursor recebido.
+    """
+    queryset = Evento.objects.all()
+    serializer_class = EventoListSerializer
+    renderer_classes = renderizadores_eventos()
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [EventoMudancasThrottle]
+
+    def get(self, request):
+        try:
+            eventos, removidos, cursor, mais = mudancas(request.query_params.get("since") or None)
+        except ValueError:
+            return Response({"detail": "Cursor inválido; refaça a sincronização sem 'since'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Recarrega a página com as relações do serializer num único SELECT
+        por_id = EventoListSerializer.podar(Evento.objects.filter(id__in=[e.id for e in eventos])).in_bulk()
+        dados = self.get_serializer([por_id[e.id] for e in eventos if e.id in por_id], many=True).data
+        log_action(request.user, AcaoAuditoria.API_CONSULTA_EVENTOS,
+                   f"Feed de mudanças via API: {len(eventos)} alterado(s), {len(removidos)} removido(s).")
+        return Response({"eventos": dados, "removidos": removidos, "cursor": cursor, "mais": mais})
+
+
 class InscricaoCreateAPI(generics.CreateAPIView):
     queryset = Inscricao.objects.all()
     serializer_class = InscricaoCreateSerializer
@@ -44,5 +206,35 @@ class InscricaoCreateAPI(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         obj = serializer.save()
-        log_action(self.request.user, "API_INSCRICAO_EVENTO",
-                   f"Inscrição via API no evento {obj.evento_id}.")
+        log_action(self.request.user, AcaoAuditoria.API_INSCRICAO_EVENTO,
+                   f"Inscrição via API no evento {obj.evento_id}.", duravel=True, alvo=obj.evento)
+
+
+class CertificadoVerificarAPI(APIView):
+    """
+    Verificação pública de certificados.
+    GET  /api/certificados/verificar/?codigo=XYZ
+    POST /api/certificados/verificar/  {"codigos": [...]}  (lote, até 500 códigos)
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [VerificacaoThrottle]
+
+    def get(self, request):
+        codigo = request.query_params.get("codigo", "").strip()
+        if not codigo:
+            return Response({"detail": "Informe o parâmetro 'codigo'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        dados = verificar([codigo]).get(codigo)
+        if dados is None:
+            return Response({"valido": False, "codigo": codigo}, status=status.HTTP_404_NOT_FOUND)
+        return Response(dados)
+
+    def post(self, request):
+        serializer = VerificacaoLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        resultado = verificar(serializer.validated_data["codigos"])
+        return Response({
+            "resultados": [dados or {"valido": False, "codigo": codigo}
+                           for codigo, dados in resultado.items()],
+        })
@@ -6,3 +6,6 @@ class SgeawebConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sgeaweb'
     verbose_name = "SGEA (aplicativo principal)"  # aparece no /admin
+
+    def ready(self):
+        from . import signals  # noqa: F401
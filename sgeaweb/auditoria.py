@@ -0,0 +1,435 @@
+"""Item 10 — gravação dos registros de auditoria.
+
+`log_action` enfileira o registro em memória e uma thread em segundo plano
+grava a fila com `bulk_create` quando ela atinge AUDITORIA_LOTE itens ou a
+cada AUDITORIA_INTERVALO segundos (o que vier primeiro). A fila é
+descarregada também no encerramento do processo. Ações que precisam ser
+duráveis usam `duravel=True` e são gravadas na hora, como antes.
+
+Se a fila estiver cheia (AUDITORIA_FILA_MAX), o registro é descartado e
+contabilizado: ver `estatisticas()`.
+
+Ações de leitura muito frequentes (AUDITORIA_ACOES_AGREGADAS) não geram uma
+linha por chamada: viram contadores por (usuário, ação, janela de
+AUDITORIA_JANELA segundos) e cada janela encerrada é gravada como um único
+registro com a contagem em `dados`. Os contadores são do processo; com
+vários workers, cada um grava a sua linha da janela.
+"""
+import atexit
+import csv
+import gzip
+import json
+import os
+import queue
+import threading
+from datetime import datetime, date, time, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from . import cursores
+from .models import Auditoria
+
+
+class GravadorAuditoria:
+    """Fila de registros + thread que os grava em lote."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._fila = None
+        self._acordar = threading.Event()
+        self._janelas = {}
+        self.enfileirados = 0
+        self.gravados = 0
+        self.descartados = 0
+        self.agregados = 0
+
+    @property
+    def lote(self):
+        return getattr(settings, "AUDITORIA_LOTE", 200)
+
+    @property
+    def intervalo(self):
+        return getattr(settings, "AUDITORIA_INTERVALO", 2.0)
+
+    def _iniciar(self):
+        # Thread criada sob demanda e recriada após fork (ex.: gunicorn com preload)
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._fila = queue.Queue(maxsize=getattr(settings, "AUDITORIA_FILA_MAX", 10_000))
+            self._pid = os.getpid()
+            threading.Thread(target=self._executar, name="auditoria-writer", daemon=True).start()
+
+    def enfileirar(self, registro):
+        if self._pid != os.getpid():
+            self._iniciar()
+        try:
+            self._fila.put_nowait(registro)
+        except queue.Full:
+            self.descartados += 1
+            return
+        self.enfileirados += 1
+        if self._fila.qsize() >= self.lote:
+            self._acordar.set()
+
+    def profundidade(self):
+        return self._fila.qsize() if self._fila is not None else 0
+
+    @property
+    def janela(self):
+        return getattr(settings, "AUDITORIA_JANELA", 60)
+
+    def agregar(self, registro):
+        """Soma o registro ao contador da sua janela em vez de enfileirá-lo."""
+        if self._pid != os.getpid():
+            self._iniciar()
+        inicio = int(registro.data_hora.timestamp()) // self.janela * self.janela
+        chave = (registro.usuario_id, registro.acao, inicio)
+        alvo = (registro.alvo_tipo_id, registro.alvo_id)
+        with self._lock:
+            contador = self._janelas.get(chave)
+            if contador is None:
+                contador = self._janelas[chave] = {"contagem": 0, "alvos": {}}
+            contador["contagem"] += 1
+            contador["alvos"][alvo] = contador["alvos"].get(alvo, 0) + 1
+            self.agregados += 1
+
+    def fechar_janelas(self, todas=False):
+        """Enfileira um registro por janela encerrada (ou por todas, no encerramento do processo)."""
+        limite = timezone.now().timestamp()
+        with self._lock:
+            prontas = [chave for chave in self._janelas if todas or chave[2] + self.janela <= limite]
+            fechadas = [(chave, self._janelas.pop(chave)) for chave in prontas]
+        for chave, contador in fechadas:
+            self.enfileirar(self._registro_agregado(chave, contador))
+
+    def _registro_agregado(self, chave, contador):
+        usuario_id, acao, inicio = chave
+        inicio = datetime.fromtimestamp(inicio, tz=timezone.get_current_timezone())
+        fim = inicio + timedelta(seconds=self.janela)
+        alvos = contador["alvos"]
+        dados = {"contagem": contador["contagem"], "janela": [inicio.isoformat(), fim.isoformat()]}
+        registro = Auditoria(usuario_id=usuario_id, acao=acao, data_hora=inicio, dados=dados,
+                             descricao=f"{contador['contagem']} ocorrência(s) agregada(s) "
+                                       f"entre {inicio:%H:%M:%S} e {fim:%H:%M:%S}.")
+        if len(alvos) == 1:
+            registro.alvo_tipo_id, registro.alvo_id = next(iter(alvos))
+        elif any(alvo_id is not None for _, alvo_id in alvos):
+            dados["alvos"] = {str(alvo_id): n for (_, alvo_id), n in alvos.items() if alvo_id is not None}
+        return registro
+
+    def _executar(self):
+        while True:
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            self.fechar_janelas()
+            self.descarregar()
+            close_old_connections()
+
+    def encerrar(self):
+        if self._pid == os.getpid():
+            self.fechar_janelas(todas=True)
+        self.descarregar()
+
+    def descarregar(self):
+        """Grava tudo o que estiver na fila (chamado pela thread e no atexit)."""
+        if self._fila is None or self._pid != os.getpid():
+            return
+        while True:
+            registros = []
+            try:
+                while len(registros) < self.lote:
+                    registros.append(self._fila.get_nowait())
+            except queue.Empty:
+                pass
+            if not registros:
+                return
+            try:
+                Auditoria.objects.bulk_create(registros)
+                self.gravados += len(registros)
+            except Exception:
+                # Evita derrubar a thread em caso de erro de log (ex.: banco bloqueado)
+                self.descartados += len(registros)
+
+
+gravador = GravadorAuditoria()
+atexit.register(gravador.encerrar)
+
+
+def estatisticas():
+    """Contadores do processo atual, para dimensionar a fila."""
+    return {
+        "profundidade": gravador.profundidade(),
+        "enfileirados": gravador.enfileirados,
+        "gravados": gravador.gravados,
+        "descartados": gravador.descartados,
+        "agregados": gravador.agregados,
+        "janelas_abertas": len(gravador._janelas),
+    }
+
+
+def log_action(user, acao: str, descricao: str, duravel: bool = False, alvo=None, dados=None):
+    """Registra uma ação. `alvo` é o objeto afetado (instância de modelo); `dados`, um dict pequeno."""
+    try:
+        registro = Auditoria(usuario_id=user.pk if user.is_authenticated else None,
+                             acao=acao,
+                             descricao=descricao,
+                             data_hora=timezone.now(),
+                             dados=dados)
+        if alvo is not None:
+            registro.alvo_tipo = ContentType.objects.get_for_model(alvo)  # cache do ContentType
+            registro.alvo_id = alvo.pk
+        if duravel or not getattr(settings, "AUDITORIA_ASSINCRONA", True):
+            # Modo síncrono (testes, shell): nada depende da thread de gravação
+            registro.save()
+        elif acao in getattr(settings, "AUDITORIA_ACOES_AGREGADAS", ()):
+            gravador.agregar(registro)
+        else:
+            gravador.enfileirar(registro)
+    except Exception:
+        # Evita quebrar fluxo em caso de erro de log
+        pass
+
+
+def contar_por_alvo(acao, inicio, fim):
+    """Quantidade de registros de `acao` por objeto afetado em [inicio, fim).
+
+    Ex.: inscrições via API por evento ontem —
+    contar_por_alvo(AcaoAuditoria.API_INSCRICAO_EVENTO, ontem_0h, hoje_0h)
+    """
+    return (Auditoria.objects
+            .filter(acao=acao, data_hora__gte=inicio, data_hora__lt=fim)
+            .values("alvo_tipo", "alvo_id")
+            .annotate(total=Count("id"))
+            .order_by("-total"))
+
+
+# Consulta (tela /auditoria/)
+
+TAMANHO_PAGINA = 100
+
+
+def intervalo_do_dia(dia: date):
+    """[início, fim) do dia no fuso do projeto — filtro que aproveita o índice de data_hora."""
+    inicio = timezone.make_aware(datetime.combine(dia, time.min))
+    fim = timezone.make_aware(datetime.combine(dia + timedelta(days=1), time.min))
+    return inicio, fim
+
+
+def consultar(dia=None, usuario=None, desde=None, ate=None):
+    """Registros filtrados por dia ou período [desde, ate] (dates) e/ou username exato.
+
+    Ordenados do mais novo para o mais antigo.
+    """
+    qs = Auditoria.objects.all()
+
+    if dia:
+        inicio, fim = intervalo_do_dia(dia)
+        qs = qs.filter(data_hora__gte=inicio, data_hora__lt=fim)
+    if desde:
+        qs = qs.filter(data_hora__gte=intervalo_do_dia(desde)[0])
+    if ate:
+        qs = qs.filter(data_hora__lt=intervalo_do_dia(ate)[1])
+
+    if usuario:
+        # Resolve o username pelo índice único de auth_user, sem JOIN na consulta principal
+        user_id = User.objects.filter(username=usuario).values_list("id", flat=True).first()
+        qs = qs.filter(usuario_id=user_id) if user_id else qs.none()
+
+    return qs.order_by("-data_hora", "-id")
+
+
+def pagina(qs, cursor=None, tamanho=TAMANHO_PAGINA):
+    """Paginação por chave (data_hora, id), do mais novo para o mais antigo.
+
+    Devolve (registros, próximo_cursor ou None).
+    """
+    return cursores.pagina(qs, "data_hora", datetime.fromisoformat, cursor, tamanho, decrescente=True)
+
+
+# Exportação (CSV / JSON Lines) em streaming
+
+FORMATOS_EXPORTACAO = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+CAMPOS_EXPORTACAO = ["id", "data_hora", "usuario", "acao", "descricao", "alvo_tipo", "alvo_id", "dados"]
+
+
+class _Eco:
+    """Pseudo-arquivo: o csv.writer devolve a linha em vez de acumulá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def _rotulo_alvo(r):
+    if not r.alvo_tipo_id:
+        return None
+    ct = ContentType.objects.get_for_id(r.alvo_tipo_id)  # em cache após o primeiro acesso
+    return f"{ct.app_label}.{ct.model}"
+
+
+def _linha_json(r):
+    return json.dumps({
+        "id": r.id,
+        "data_hora": r.data_hora.isoformat(),
+        "usuario": r.usuario.username if r.usuario else None,
+        "acao": r.acao,
+        "descricao": r.descricao,
+        "alvo_tipo": _rotulo_alvo(r),
+        "alvo_id": r.alvo_id,
+        "dados": r.dados,
+    }, ensure_ascii=False) + "\n"
+
+
+def exportar_linhas(qs, formato="csv", chunk_size=2000):
+    """Gera o log filtrado linha a linha; a memória não cresce com o total de registros."""
+    registros = qs.select_related("usuario").iterator(chunk_size=chunk_size)
+
+    if formato == "csv":
+        writer = csv.writer(_Eco())
+        yield writer.writerow(CAMPOS_EXPORTACAO)
+        for r in registros:
+            yield writer.writerow([r.id, r.data_hora.isoformat(),
+                                   r.usuario.username if r.usuario else "", r.acao, r.descricao,
+                                   _rotulo_alvo(r) or "", r.alvo_id or "",
+                                   json.dumps(r.dados, ensure_ascii=False) if r.dados is not None else ""])
+    elif formato == "jsonl":
+        for r in registros:
+            yield _linha_json(r)
+    else:
+        raise ValueError(f"Formato desconhecido: {formato}")
+
+
+# Retenção e arquivamento
+#
+# Registros mais antigos que AUDITORIA_RETENCAO_DIAS saem da tabela e vão para
+# um arquivo JSON Lines comprimido (gzip) por mês em AUDITORIA_ARQUIVO_DIR —
+# cada mês funciona como uma partição fria. Cada bloco é gravado no arquivo
+# antes de ser apagado do banco; se o processo cair entre as duas etapas, a
+# próxima execução regrava o bloco e a leitura descarta ids repetidos.
+
+def diretorio_arquivo():
+    return Path(getattr(settings, "AUDITORIA_ARQUIVO_DIR", Path(settings.BASE_DIR) / "auditoria_arquivo"))
+
+
+def caminho_arquivo(ano, mes):
+    return diretorio_arquivo() / f"auditoria-{ano:04d}-{mes:02d}.jsonl.gz"
+
+
+def data_corte(dias=None):
+    dias = dias if dias is not None else getattr(settings, "AUDITORIA_RETENCAO_DIAS", 180)
+    return timezone.now() - timedelta(days=dias)
+
+
+def arquivar(corte, chunk_size=1000, progresso=None):
+    """Move para os arquivos mensais os registros com data_hora < corte. Retorna quantos foram movidos."""
+    movidos = 0
+    while True:
+        bloco = list(Auditoria.objects
+                     .filter(data_hora__lt=corte)
+                     .select_related("usuario")
+                     .order_by("data_hora", "id")[:chunk_size])
+        if not bloco:
+            return movidos
+
+        por_mes = {}
+        for r in bloco:
+            local = timezone.localtime(r.data_hora)
+            por_mes.setdefault((local.year, local.month), []).append(_linha_json(r))
+
+        for (ano, mes), linhas in por_mes.items():
+            caminho = caminho_arquivo(ano, mes)
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            # "ab" acrescenta um novo membro gzip; gzip.open lê todos em sequência
+            with gzip.open(caminho, "at", encoding="utf-8") as f:
+                f.writelines(linhas)
+                f.flush()
+                os.fsync(f.fileno())
+
+        # Transações curtas: escritores da auditoria não ficam bloqueados
+        with transaction.atomic():
+            Auditoria.objects.filter(id__in=[r.id for r in bloco]).delete()
+
+        movidos += len(bloco)
+        if progresso:
+            progresso(movidos)
+
+
+CACHE_ARQUIVO_TTL = 3600
+
+
+def _linhas_do_dia(caminho, dia):
+    """Linhas de um dia lidas do arquivo mensal em streaming: só as do dia ficam na memória (sem repetir ids)."""
+    linhas = {}
+    with gzip.open(caminho, "rt", encoding="utf-8") as f:
+        for linha in f:
+            dados = json.loads(linha)
+            data_hora = datetime.fromisoformat(dados["data_hora"])
+            if timezone.localtime(data_hora).date() != dia:
+                continue
+            linhas[dados["id"]] = (
+                dados["id"], data_hora, dados["usuario"], dados["acao"], dados["descricao"],
+                dados.get("alvo_id"), dados.get("dados"),
+            )
+    return list(linhas.values())
+
+
+def _arquivados_do_dia(dia):
+    caminho = caminho_arquivo(dia.year, dia.month)
+    try:
+        info = caminho.stat()
+    except FileNotFoundError:
+        return []
+
+    # A chave muda quando `arquivar` acrescenta ao arquivo: nunca devolve um dia desatualizado
+    chave = f"auditoria_arquivo:{dia:%Y-%m}:{info.st_mtime_ns}:{info.st_size}:{dia.isoformat()}"
+    linhas = cache.get(chave)
+    if linhas is None:
+        # Só o dia pedido vai para o cache; a paginação desse dia já sai dele
+        linhas = _linhas_do_dia(caminho, dia)
+        cache.set(chave, linhas, CACHE_ARQUIVO_TTL)
+    return linhas
+
+
+def ler_arquivados(dia, usuario=None):
+    """Registros arquivados de um dia (mais novo primeiro), no formato usado pelo template."""
+    registros = [
+        SimpleNamespace(id=pk, data_hora=data_hora, usuario=nome, acao=acao, descricao=descricao,
+                        alvo_id=alvo_id, dados=dados)
+        for pk, data_hora, nome, acao, descricao, alvo_id, dados in _arquivados_do_dia(dia)
+        if not usuario or nome == usuario
+    ]
+    return sorted(registros, key=lambda r: (r.data_hora, r.id), reverse=True)
+
+
+def pagina_do_dia(dia, usuario=None, cursor=None, tamanho=TAMANHO_PAGINA):
+    """Como `pagina`, mas para um dia que pode estar (parcialmente) arquivado.
+
+    Junta o que ainda está no banco com o arquivo do mês; o volume é limitado a um dia.
+    """
+    arquivados = ler_arquivados(dia, usuario)
+    if not arquivados:
+        return pagina(consultar(dia=dia, usuario=usuario).select_related("usuario"), cursor, tamanho)
+
+    ids = {r.id for r in arquivados}
+    no_banco = [r for r in consultar(dia=dia, usuario=usuario).select_related("usuario") if r.id not in ids]
+    registros = sorted(no_banco + arquivados, key=lambda r: (r.data_hora, r.id), reverse=True)
+
+    if cursor:
+        chave = cursores.decodificar(cursor, datetime.fromisoformat)
+        registros = [r for r in registros if (r.data_hora, r.id) < chave]
+
+    ultimo = registros[tamanho - 1] if len(registros) > tamanho else None
+    proximo = cursores.codificar(ultimo.data_hora, ultimo.id) if ultimo else None
+    return registros[:tamanho], proximo
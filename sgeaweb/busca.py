@@ -0,0 +1,92 @@
+"""Busca textual de eventos (título, descrição, local e nome do tipo).
+
+No SQLite a busca usa a tabela virtual FTS5 `evento_busca` (rowid = id do
+evento), mantida por triggers criados na migração 0009: INSERT/UPDATE/DELETE
+em `evento` e a troca de nome em `tipo_evento` refletem no índice dentro da
+mesma transação, inclusive para `QuerySet.update()`. O MATCH vira uma
+subconsulta da consulta do chamador, então filtros (vitrine, API, admin)
+valem antes de qualquer limite. Os resultados vêm ordenados por relevância
+(bm25, com peso maior para o título) e cada termo casa por prefixo
+("semin" encontra "Seminário").
+
+Em outros bancos, ou se a tabela não existir, cai para `icontains`.
+Para recriar o índice: `python manage.py reindexar_busca`.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+TABELA = "evento_busca"
+# Pesos do bm25 na ordem das colunas: titulo, descricao, local, tipo
+PESOS = (10.0, 1.0, 3.0, 5.0)
+
+TERMO = re.compile(r"\w+", re.UNICODE)
+
+# Tabela e triggers: SQL fixo na migração 0009 (não depende deste módulo)
+SQL_REINDEXAR = [
+    f"DELETE FROM {TABELA}",
+    f"""INSERT INTO {TABELA}(rowid, titulo, descricao, local, tipo)
+        SELECT e.id, e.titulo, e.descricao, e.local, t.nome
+        FROM evento e JOIN tipo_evento t ON t.id = e.TIPO_id""",
+]
+
+
+def suportado(conexao=connection):
+    return conexao.vendor == "sqlite"
+
+
+def expressao_fts(texto):
+    """Converte o texto digitado numa consulta FTS5 segura: todos os termos, cada um por prefixo."""
+    termos = TERMO.findall(texto or "")
+    return " ".join(f'"{t}"*' for t in termos)
+
+
+_indice_criado = False
+
+
+def indice_disponivel():
+    """A tabela FTS5 existe (migração 0009 aplicada)? Uma vez confirmado, não consulta de novo."""
+    global _indice_criado
+    if not _indice_criado:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [TABELA])
+            _indice_criado = cursor.fetchone() is not None
+    return _indice_criado
+
+
+def buscar(qs, texto):
+    """Filtra `qs` (eventos) por `texto` e ordena por relevância.
+
+    O MATCH entra na própria consulta (`id IN (SELECT rowid ...)`), junto com
+    os filtros de `qs`; qualquer corte ([:n], paginação) vale depois deles.
+    """
+    if not TERMO.search(texto or ""):
+        return qs.none()
+    if suportado() and indice_disponivel():
+        expressao = expressao_fts(texto)
+        pesos = ", ".join(str(p) for p in PESOS)
+        casam = RawSQL(f"SELECT rowid FROM {TABELA} WHERE {TABELA} MATCH %s", [expressao])
+        # bm25 é negativo: quanto menor, mais relevante. Correlacionada pela tabela `evento`
+        # (a consulta principal de Evento não usa alias)
+        relevancia = RawSQL(
+            f"SELECT bm25({TABELA}, {pesos}) FROM {TABELA} WHERE {TABELA} MATCH %s AND rowid = evento.id",
+            [expressao], output_field=FloatField(),
+        )
+        return qs.filter(id__in=casam).annotate(relevancia=relevancia).order_by("relevancia", "id")
+
+    filtro = Q()
+    for termo in TERMO.findall(texto):
+        filtro &= (Q(titulo__icontains=termo) | Q(descricao__icontains=termo)
+                   | Q(local__icontains=termo) | Q(TIPO__nome__icontains=termo))
+    return qs.filter(filtro)
+
+
+def reindexar():
+    """Recria o conteúdo do índice a partir das tabelas (ex.: após restaurar um backup)."""
+    with connection.cursor() as cursor:
+        for sql in SQL_REINDEXAR:
+            cursor.execute(sql)
+        cursor.execute(f"SELECT count(*) FROM {TABELA}")
+        return cursor.fetchone()[0]
@@ -0,0 +1,16 @@
+"""Cache visto por todos os workers do host (alias "compartilhado" em CACHES).
+
+O cache padrão é locmem, um por processo: serve para o que pode ficar
+velho até o TTL. O que precisa valer para todos os workers assim que é
+invalidado (tokens da API, versões das páginas) fica neste, em arquivos,
+sem consultas nem escritas no banco da aplicação.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+ALIAS = "compartilhado"
+
+
+def cache():
+    # Sem o alias configurado, cai no padrão (testes, instalações antigas)
+    return caches[ALIAS if ALIAS in settings.CACHES else "default"]
@@ -0,0 +1,119 @@
+"""Cache das páginas públicas (home e detalhe do evento).
+
+- Visitantes anônimos recebem a página inteira do cache (`cache_anonimo`).
+- Usuários logados recebem a página renderizada na hora, mas o trecho que
+  depende do banco vem do cache por perfil (`fragmento`).
+- Nenhuma chave é apagada: cada chave inclui a versão das dependências
+  ("vitrine", "evento:<pk>", "cadastros") e os signals apenas incrementam
+  essas versões. As versões ficam no cache "compartilhado" (todos os
+  workers veem o incremento); páginas e fragmentos, no cache padrão do
+  processo, onde as entradas antigas expiram pelo PAGINAS_CACHE_TTL.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from . import cache_compartilhado
+
+PREFIXO = "paginas:"
+
+contadores = {"pagina_hits": 0, "pagina_misses": 0, "fragmento_hits": 0, "fragmento_misses": 0}
+
+
+def _ttl():
+    return getattr(settings, "PAGINAS_CACHE_TTL", 300)
+
+
+def _chave_versao(nome):
+    return f"{PREFIXO}versao:{nome}"
+
+
+def versoes(nomes):
+    """Versão atual de cada dependência, como texto para compor chaves."""
+    chaves = [_chave_versao(n) for n in nomes]
+    compartilhado = cache_compartilhado.cache()
+    atuais = compartilhado.get_many(chaves)
+    for chave in chaves:
+        if chave not in atuais:
+            # Começa do relógio: se a versão for despejada do cache, não volta a um valor já usado
+            compartilhado.add(chave, time.time_ns() // 1000, None)
+            atuais[chave] = compartilhado.get(chave)
+    return "-".join(str(atuais[c]) for c in chaves)
+
+
+def invalidar(*nomes):
+    """Torna obsoletas as páginas e fragmentos que dependem de `nomes`."""
+    compartilhado = cache_compartilhado.cache()
+    for nome in nomes:
+        try:
+            compartilhado.incr(_chave_versao(nome))
+        except ValueError:
+            compartilhado.set(_chave_versao(nome), time.time_ns() // 1000, None)
+
+
+def _resumo(texto):
+    return hashlib.md5(texto.encode()).hexdigest()
+
+
+def cache_anonimo(*dependencias, parametros=()):
+    """Decorator de view: página inteira em cache para visitantes anônimos.
+
+    `dependencias` aceitam os kwargs da URL, ex.: "evento:{pk}". A chave leva
+    só o caminho, os `parametros` da query string que a view lê e a data de
+    hoje (a página pode mudar na virada do dia); outros parâmetros não
+    criam entradas novas.
+    """
+    def decorador(view):
+        @wraps(view)
+        def envoltorio(request, *args, **kwargs):
+            # Mensagens pendentes (ex.: "Logout realizado") tornam a página única
+            if (request.method != "GET" or request.user.is_authenticated
+                    or len(messages.get_messages(request))):
+                return view(request, *args, **kwargs)
+
+            nomes = [d.format(**kwargs) for d in dependencias]
+            variacao = [request.path, timezone.localdate().isoformat(),
+                        *(f"{p}={request.GET.get(p, '')}" for p in parametros)]
+            chave = f"{PREFIXO}pagina:{versoes(nomes)}:{_resumo('|'.join(variacao))}"
+            guardada = cache.get(chave)
+            if guardada is not None:
+                contadores["pagina_hits"] += 1
+                conteudo, content_type = guardada
+                resposta = HttpResponse(conteudo, content_type=content_type)
+                resposta["X-Cache"] = "HIT"
+                return resposta
+
+            contadores["pagina_misses"] += 1
+            resposta = view(request, *args, **kwargs)
+            if resposta.status_code == 200 and not resposta.streaming:
+                cache.set(chave, (resposta.content, resposta["Content-Type"]), _ttl())
+                resposta["X-Cache"] = "MISS"
+            return resposta
+        return envoltorio
+    return decorador
+
+
+def fragmento(nome, dependencias, variacoes, gerar):
+    """HTML de um trecho de página: do cache ou de `gerar()` (que só roda no miss)."""
+    chave = (f"{PREFIXO}fragmento:{nome}:{versoes(dependencias)}:"
+             f"{_resumo('|'.join(str(v) for v in variacoes))}")
+    html = cache.get(chave)
+    if html is None:
+        contadores["fragmento_misses"] += 1
+        html = gerar()
+        cache.set(chave, html, _ttl())
+    else:
+        contadores["fragmento_hits"] += 1
+    return mark_safe(html)
+
+
+def estatisticas():
+    """Acertos e faltas do processo atual."""
+    return dict(contadores)
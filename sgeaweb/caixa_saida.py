@@ -0,0 +1,135 @@
+"""Caixa de saída de e-mails.
+
+As views só enfileiram (`enfileirar`): o cadastro não espera o SMTP. O
+comando `enviar_emails` chama `enviar_lote`, que:
+
+- reserva até EMAIL_SAIDA_LOTE e-mails pendentes (UPDATE condicional com um
+  identificador de lote: dois workers nunca pegam o mesmo e-mail, sem
+  depender de SELECT FOR UPDATE, que o SQLite não tem);
+- envia todos por uma única conexão (`get_connection()` aberta uma vez,
+  `send_messages()` por mensagem para registrar o resultado de cada uma);
+- em falha, agenda nova tentativa com espera exponencial
+  (EMAIL_SAIDA_ESPERA * 2^(tentativas-1), até 1 h) e, depois de
+  EMAIL_SAIDA_TENTATIVAS, marca como FALHOU.
+
+Reservas de um worker que morreu expiram após EMAIL_SAIDA_RESERVA segundos
+e os e-mails voltam para a fila.
+"""
+import random
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import EmailSaida, StatusEmail
+
+ESPERA_MAXIMA = 3600
+
+
+def _config(nome, padrao):
+    return getattr(settings, nome, padrao)
+
+
+def enfileirar(assunto, destinatarios, corpo="", html="", remetente=None):
+    return EmailSaida.objects.create(
+        assunto=assunto,
+        remetente=remetente or settings.DEFAULT_FROM_EMAIL,
+        destinatarios=list(destinatarios),
+        corpo=corpo,
+        html=html or "",
+    )
+
+
+def mensagem(email):
+    msg = EmailMultiAlternatives(email.assunto, email.corpo, email.remetente, email.destinatarios)
+    if email.html:
+        msg.attach_alternative(email.html, "text/html")
+    return msg
+
+
+def espera(tentativas):
+    """Segundos até a próxima tentativa (exponencial, com um pouco de aleatoriedade)."""
+    base = _config("EMAIL_SAIDA_ESPERA", 30) * 2 ** (tentativas - 1)
+    return min(base, ESPERA_MAXIMA) * random.uniform(1, 1.25)
+
+
+def reservar(tamanho=None, agora=None):
+    """Marca até `tamanho` e-mails prontos como ENVIANDO para este worker e os devolve."""
+    agora = agora or timezone.now()
+    tamanho = tamanho or _config("EMAIL_SAIDA_LOTE", 100)
+    prontos = (Q(status=StatusEmail.PENDENTE, proxima_tentativa__lte=agora)
+               | Q(status=StatusEmail.ENVIANDO, reservado_ate__lt=agora))
+    ids = list(EmailSaida.objects.filter(prontos).order_by("proxima_tentativa", "id")
+               .values_list("id", flat=True)[:tamanho])
+    if not ids:
+        return []
+
+    lote = uuid.uuid4().hex
+    # Só leva quem ainda estiver pronto: se outro worker reservou antes, a linha fica de fora
+    EmailSaida.objects.filter(prontos, id__in=ids).update(
+        status=StatusEmail.ENVIANDO, lote=lote,
+        reservado_ate=agora + timedelta(seconds=_config("EMAIL_SAIDA_RESERVA", 300)),
+    )
+    return list(EmailSaida.objects.filter(lote=lote, status=StatusEmail.ENVIANDO).order_by("id"))
+
+
+def _falhou(email, erro, agora):
+    email.tentativas += 1
+    email.erro = f"{type(erro).__name__}: {erro}"[:2000]
+    email.reservado_ate = None
+    if email.tentativas >= _config("EMAIL_SAIDA_TENTATIVAS", 5):
+        email.status = StatusEmail.FALHOU
+    else:
+        email.status = StatusEmail.PENDENTE
+        email.proxima_tentativa = agora + timedelta(seconds=espera(email.tentativas))
+
+
+def enviar_lote(tamanho=None, conexao=None):
+    """Reserva e envia um lote. Devolve (enviados, falhas)."""
+    emails = reservar(tamanho)
+    if not emails:
+        return 0, 0
+
+    conexao = conexao or get_connection(fail_silently=False)
+    enviados = falhas = 0
+    try:
+        conexao.open()
+    except Exception as erro:
+        # Servidor fora do ar: o lote inteiro volta para a fila
+        agora = timezone.now()
+        for email in emails:
+            _falhou(email, erro, agora)
+        falhas = len(emails)
+    else:
+        try:
+            for email in emails:
+                try:
+                    conexao.send_messages([mensagem(email)])
+                except Exception as erro:
+                    _falhou(email, erro, timezone.now())
+                    falhas += 1
+                else:
+                    email.status = StatusEmail.ENVIADO
+                    email.tentativas += 1
+                    email.enviado_em = timezone.now()
+                    email.reservado_ate = None
+                    email.erro = ""
+                    enviados += 1
+        finally:
+            conexao.close()
+
+    EmailSaida.objects.bulk_update(
+        emails, ["status", "tentativas", "proxima_tentativa", "reservado_ate", "erro", "enviado_em"]
+    )
+    return enviados, falhas
+
+
+def resumo():
+    """Quantidade de e-mails por status."""
+    contagem = dict.fromkeys(StatusEmail.values, 0)
+    for linha in EmailSaida.objects.values("status").order_by().annotate(n=Count("id")):
+        contagem[linha["status"]] = linha["n"]
+    return contagem
@@ -0,0 +1,94 @@
+"""Emissão de certificados em lote (Item 8).
+
+Pipeline por conjuntos: uma única consulta anti-join encontra as inscrições
+sem certificado, o resultado é lido em blocos com `.iterator()` e cada bloco
+vira um `bulk_create` de certificados e outro de registros de auditoria.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from .models import Inscricao, Certificado, Auditoria, AcaoAuditoria
+from . import verificacao
+
+
+def inscricoes_pendentes(hoje=None, since=None, evento_id=None):
+    """Inscrições com presença confirmada, de eventos encerrados, ainda sem certificado."""
+    hoje = hoje or timezone.now().date()
+    qs = Inscricao.objects.filter(
+        presenca_confirmada=True,
+        evento__data_fim__lte=hoje,
+        certificado__isnull=True,
+    )
+    if since:
+        qs = qs.filter(evento__data_fim__gte=since)
+    if evento_id:
+        qs = qs.filter(evento_id=evento_id)
+    return qs.order_by("id")
+
+
+def _gravar_bloco(bloco, acao):
+    """Grava um bloco de (inscricao_id, evento_id, organizador_id). Retorna quantos foram emitidos."""
+    certs = [Certificado(inscricao_id=insc_id, codigo_validacao=get_random_string(16))
+             for insc_id, _, _ in bloco]
+    try:
+        with transaction.atomic():
+            Certificado.objects.bulk_create(certs)
+            emitidos = list(zip(bloco, certs))
+    except IntegrityError:
+        # Outro processo emitiu parte do bloco ao mesmo tempo: cai para linha a linha
+        emitidos = []
+        for item, cert in zip(bloco, certs):
+            obj, created = Certificado.objects.get_or_create(
+                inscricao_id=item[0],
+                defaults={"codigo_validacao": cert.codigo_validacao},
+            )
+            if created:
+                emitidos.append((item, obj))
+
+    # bulk_create não dispara post_save: avisa o filtro de verificação diretamente
+    verificacao.registrar([cert.codigo_validacao for _, cert in emitidos])
+    tipo_inscricao = ContentType.objects.get_for_model(Inscricao)
+    Auditoria.objects.bulk_create([
+        Auditoria(
+            usuario_id=org_id,
+            acao=acao,
+            descricao=f"Evento #{ev_id} - Inscrição #{insc_id} - Código {cert.codigo_validacao}",
+            alvo_tipo=tipo_inscricao,
+            alvo_id=insc_id,
+            dados={"evento": ev_id, "codigo": cert.codigo_validacao},
+        )
+        for (insc_id, ev_id, org_id), cert in emitidos
+    ])
+    return len(emitidos)
+
+
+def emitir_pendentes(qs, chunk_size=1000, dry_run=False, acao=AcaoAuditoria.CERTIFICADO_GERADO_AUTO_CMD,
+                     progresso=None):
+    """Emite certificados para todas as inscrições de `qs`, em blocos de `chunk_size`.
+
+    `progresso(lidos, emitidos)` é chamado após cada bloco, se informado.
+    Retorna a tupla (lidos, emitidos).
+    """
+    linhas = qs.values_list("id", "evento_id", "evento__organizador_id").iterator(chunk_size=chunk_size)
+    lidos = emitidos = 0
+    bloco = []
+
+    def descarregar():
+        nonlocal emitidos
+        if not dry_run:
+            emitidos += _gravar_bloco(bloco, acao)
+        if progresso:
+            progresso(lidos, emitidos)
+        bloco.clear()
+
+    for linha in linhas:
+        bloco.append(linha)
+        lidos += 1
+        if len(bloco) >= chunk_size:
+            descarregar()
+    if bloco:
+        descarregar()
+
+    return lidos, emitidos
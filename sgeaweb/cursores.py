@@ -0,0 +1,59 @@
+"""Paginação por chave (keyset) com cursor opaco, para listas ordenadas por (campo, id).
+
+Usada pela vitrine de eventos ((data_inicio, id) crescente) e pela
+auditoria ((data_hora, id) decrescente). O cursor é o par do último item
+entregue em base64; a página seguinte é uma faixa do índice, então o custo
+é o mesmo na página 1 e na 1.000.
+"""
+import base64
+
+from django.db.models import Q
+from django.utils.http import urlencode
+
+
+def codificar(valor, pk):
+    bruto = f"{valor.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(bruto.encode()).decode()
+
+
+def decodificar(cursor, converter):
+    """Devolve (valor, id) ou levanta ValueError se o cursor for inválido.
+
+    `converter` transforma o texto ISO de volta (ex.: date.fromisoformat).
+    """
+    try:
+        valor, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return converter(valor), int(pk)
+    except Exception:
+        raise ValueError("Cursor inválido.")
+
+
+def pagina(qs, campo, converter, cursor=None, tamanho=50, decrescente=False):
+    """Próxima página depois do cursor. Devolve (itens, próximo_cursor ou None).
+
+    `qs` já vem ordenado por (campo, id) no sentido indicado por `decrescente`.
+    """
+    if cursor:
+        valor, pk = decodificar(cursor, converter)
+        # O termo <=/>= delimita a faixa do índice; o OR só desempata pelo id
+        if decrescente:
+            qs = qs.filter(Q(**{f"{campo}__lt": valor}) | Q(id__lt=pk), **{f"{campo}__lte": valor})
+        else:
+            qs = qs.filter(Q(**{f"{campo}__gt": valor}) | Q(id__gt=pk), **{f"{campo}__gte": valor})
+
+    itens = list(qs[:tamanho + 1])
+    ultimo = itens[tamanho - 1] if len(itens) > tamanho else None
+    return itens[:tamanho], (codificar(getattr(ultimo, campo), ultimo.id) if ultimo else None)
+
+
+def links(params, proximo, cursor):
+    """(proxima_url, primeira_url) dos links da página; `params` são os filtros (o cursor é ignorado)."""
+    base = params.copy()
+    base.pop("cursor", None)
+    proxima_url = None
+    if proximo:
+        seguinte = base.copy()
+        seguinte["cursor"] = proximo
+        proxima_url = f"?{urlencode(seguinte, doseq=True)}"
+    primeira_url = f"?{urlencode(base, doseq=True)}" if cursor else None
+    return proxima_url, primeira_url
@@ -0,0 +1,163 @@
+"""Listagem pública de eventos (página inicial).
+
+A vitrine lê só as colunas que o card usa, calcula as vagas restantes na
+própria consulta (a partir do contador `vagas_ocupadas`) e pagina por chave
+(data_inicio, id): o custo não cresce com os anos de eventos acumulados.
+"""
+import base64
+import json
+from datetime import date, datetime, timedelta
+
+from django.db.models import Count, DateField, F, Max, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Collate
+from django.utils import timezone
+
+from . import cursores
+from .models import TEM_VAGA, Evento, EventoRemovido, Inscricao
+
+TAMANHO_PAGINA = 12
+TAMANHO_BUSCA = 48  # resultados da busca (?q=) são exibidos por relevância, sem cursor
+# Campos exibidos no card da home (sem `descricao`, que pode ser longa)
+CAMPOS_CARD = ("id", "titulo", "data_inicio", "data_fim", "local", "banner", "vagas")
+
+
+def terminam_desde(qs, dia):
+    """Eventos com data_fim >= dia, lidos como faixa do índice (data_inicio, id).
+
+    `data_fim >= dia` sozinho não combina com a ordem (data_inicio, id): o
+    SQLite varre a tabela inteira na ordem do índice (passando por todos os
+    eventos antigos) ou ordena em memória. O menor data_inicio desses
+    eventos, lido pelo índice (data_fim, data_inicio), vira o início da
+    faixa. O `+` tira data_inicio do atalho de MIN pelo índice de
+    data_inicio, que também percorreria os eventos antigos.
+    """
+    menor = RawSQL(f"SELECT MIN(+data_inicio) FROM {Evento._meta.db_table} WHERE data_fim >= %s", [dia],
+                   output_field=DateField())
+    return qs.filter(data_fim__gte=dia, data_inicio__gte=menor)
+
+
+def vitrine(todos=False, hoje=None):
+    """Eventos da home em ordem cronológica; por padrão só os que ainda não terminaram."""
+    qs = (Evento.objects
+          .only(*CAMPOS_CARD)
+          .annotate(restantes=F("vagas") - F("vagas_ocupadas"))
+          .order_by("data_inicio", "id"))
+    if not todos:
+        qs = terminam_desde(qs, hoje or timezone.localdate())
+    return qs
+
+
+def filtrar(qs, desde=None, ate=None, tipo=None, local=None, organizador=None, responsavel=None,
+            com_vagas=False):
+    """Filtros da API de eventos; cada um é uma busca (SEARCH) num índice de `Evento` que
+    já entrega a ordem (data_inicio, id), sem ordenação em memória.
+
+    O período seleciona eventos que tocam o intervalo [desde, ate]. `local` é
+    o nome exato do local, sem diferenciar maiúsculas; para procurar parte do
+    nome use a busca textual (?q=), que também indexa o local.
+    """
+    if desde:
+        qs = terminam_desde(qs, desde)
+    if ate:
+        qs = qs.filter(data_inicio__lte=ate)
+    if tipo:
+        qs = qs.filter(TIPO_id=tipo)
+    if organizador:
+        qs = qs.filter(organizador_id=organizador)
+    if responsavel:
+        qs = qs.filter(responsavel_id=responsavel)
+    if local:
+        qs = qs.alias(local_ci=Collate("local", "NOCASE")).filter(local_ci=local)
+    if com_vagas:
+        qs = qs.alias(tem_vaga=TEM_VAGA).filter(tem_vaga=1)
+    return qs
+
+
+def carimbo_colecao():
+    """Versão barata da coleção de eventos: (última alteração, versão).
+
+    Inclusões e alterações de evento mudam a data (renomear um tipo ou um
+    usuário exibido também, via signals); exclusões mudam o total. Reservas
+    não tocam o evento, mas mudam o resultado de `com_vagas`: a versão leva
+    também o maior id e o total de inscrições (uma inscrição nova sempre
+    aumenta o id; uma removida, o total). Tudo sai de índices.
+    """
+    eventos = Evento.objects.aggregate(ultimo=Max("atualizado_em"), total=Count("id"))
+    inscricoes = Inscricao.objects.aggregate(ultima=Max("id"), total=Count("id"))
+    versao = f"{eventos['total']}:{inscricoes['ultima'] or 0}:{inscricoes['total']}"
+    return eventos["ultimo"], versao
+
+
+def marcar_alterados(filtro):
+    """Põe no feed de mudanças os eventos de `filtro` (algo exibido com eles mudou)."""
+    return Evento.objects.filter(filtro).update(atualizado_em=timezone.now())
+
+
+def pagina(qs, cursor=None, tamanho=TAMANHO_PAGINA):
+    """Próxima página depois do cursor. Devolve (eventos, próximo_cursor ou None)."""
+    return cursores.pagina(qs, "data_inicio", date.fromisoformat, cursor, tamanho)
+
+
+# Feed de mudanças (/api/eventos/changes/)
+#
+# O cursor guarda a posição (atualizado_em, id) do último evento entregue e o
+# id da última lápide. Cada chamada lê só o que mudou depois disso, pelo
+# índice de `atualizado_em`. Alterações mais novas que MARGEM_FEED ficam para
+# a próxima chamada: dá tempo de transações ainda abertas confirmarem com
+# carimbos anteriores ao cursor.
+
+LIMITE_FEED = 500
+MARGEM_FEED = timedelta(seconds=2)
+
+
+def codificar_cursor_feed(posicao):
+    bruto = json.dumps(posicao, separators=(",", ":"))
+    return base64.urlsafe_b64encode(bruto.encode()).decode()
+
+
+def decodificar_cursor_feed(cursor):
+    """Devolve {"t": iso ou None, "i": id, "r": id da lápide} ou levanta ValueError."""
+    try:
+        posicao = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if posicao["t"] is not None:
+            datetime.fromisoformat(posicao["t"])
+        int(posicao["i"]), int(posicao["r"])
+        return posicao
+    except Exception:
+        raise ValueError("Cursor inválido.")
+
+
+def mudancas(cursor=None, limite=LIMITE_FEED):
+    """Eventos criados/alterados e ids removidos desde `cursor`.
+
+    Sem cursor, começa do zero (sincronização inicial completa, em páginas)
+    e ignora lápides antigas. Devolve (eventos, removidos, novo_cursor, mais).
+    """
+    if cursor:
+        posicao = decodificar_cursor_feed(cursor)
+    else:
+        ultima_lapide = EventoRemovido.objects.order_by("-id").values_list("id", flat=True).first()
+        posicao = {"t": None, "i": 0, "r": ultima_lapide or 0}
+
+    corte = timezone.now() - MARGEM_FEED
+    qs = Evento.objects.filter(atualizado_em__lt=corte).order_by("atualizado_em", "id")
+    if posicao["t"]:
+        desde = datetime.fromisoformat(posicao["t"])
+        qs = qs.filter(Q(atualizado_em__gt=desde) | Q(id__gt=posicao["i"]), atualizado_em__gte=desde)
+    eventos = list(qs[:limite + 1])
+    mais = len(eventos) > limite
+    eventos = eventos[:limite]
+
+    lapides = list(EventoRemovido.objects
+                   .filter(id__gt=posicao["r"], removido_em__lt=corte)
+                   .order_by("id")
+                   .values_list("id", "evento_id")[:limite + 1])
+    mais = mais or len(lapides) > limite
+    lapides = lapides[:limite]
+
+    if eventos:
+        posicao = {**posicao, "t": eventos[-1].atualizado_em.isoformat(), "i": eventos[-1].id}
+    if lapides:
+        posicao = {**posicao, "r": lapides[-1][0]}
+    return eventos, [evento_id for _, evento_id in lapides], codificar_cursor_feed(posicao), mais
@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sgeaweb.models import Certificado
+from sgeaweb.pdf import obter_pdf, caminho_cache
+
+
+class Command(BaseCommand):
+    help = "Pré-renderiza no cache os PDFs de certificados de eventos encerrados recentemente."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=7,
+                            help="Eventos encerrados nos últimos N dias (padrão: 7).")
+        parser.add_argument("--evento", type=int, help="Limita a um evento (ID).")
+
+    def handle(self, *args, **options):
+        hoje = timezone.now().date()
+        qs = (Certificado.objects
+              .select_related("inscricao__participante", "inscricao__evento")
+              .filter(inscricao__evento__data_fim__lte=hoje,
+                      inscricao__evento__data_fim__gte=hoje - timedelta(days=options["dias"])))
+        if options["evento"]:
+            qs = qs.filter(inscricao__evento_id=options["evento"])
+
+        inicio = time.monotonic()
+        gerados = existentes = 0
+        for cert in qs.iterator(chunk_size=500):
+            if caminho_cache(cert.codigo_validacao).exists():
+                existentes += 1
+                continue
+            obter_pdf(cert)
+            gerados += 1
+
+        decorrido = time.monotonic() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"PDFs gerados: {gerados} | já em cache: {existentes} (em {decorrido:.2f}s)"
+        ))
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sgeaweb.auditoria import arquivar, data_corte, diretorio_arquivo
+from sgeaweb.models import Auditoria
+
+
+class Command(BaseCommand):
+    help = "Move registros de auditoria antigos para arquivos JSONL.gz mensais e os apaga do banco."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int,
+                            help="Retenção no banco, em dias (padrão: AUDITORIA_RETENCAO_DIAS).")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Registros por transação (padrão: 1000).")
+        parser.add_argument("--dry-run", action="store_true", help="Apenas conta os registros a arquivar.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size deve ser maior que zero.")
+
+        dias = options["dias"] if options["dias"] is not None else getattr(settings, "AUDITORIA_RETENCAO_DIAS", 180)
+        corte = data_corte(dias)
+        if options["dry_run"]:
+            total = Auditoria.objects.filter(data_hora__lt=corte).count()
+            self.stdout.write(self.style.WARNING(f"[dry-run] Registros anteriores a {corte:%Y-%m-%d}: {total}"))
+            return
+
+        inicio = time.monotonic()
+
+        def progresso(movidos):
+            decorrido = time.monotonic() - inicio
+            self.stdout.write(f"  {movidos} registros arquivados ({movidos / decorrido:.0f}/s)")
+
+        movidos = arquivar(corte, chunk_size=options["chunk_size"], progresso=progresso)
+        self.stdout.write(self.style.SUCCESS(
+            f"Registros arquivados: {movidos} em {diretorio_arquivo()} "
+            f"(anteriores a {corte:%Y-%m-%d}, {time.monotonic() - inicio:.2f}s)"
+        ))
@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from sgeaweb.api.renderers import MessagePackRenderer, OrjsonRenderer, msgpack, orjson
+from sgeaweb.api.serializers import EventoListSerializer
+from sgeaweb.models import Evento
+
+
+class _Desfazer(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Micro-benchmark da listagem de eventos da API: serializer do DRF x caminho rápido (.values()), "
+            "e JSONRenderer x orjson x MessagePack. Os eventos de teste são criados numa transação desfeita ao final.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", type=int, default=10_000, help="Eventos na listagem (padrão: 10000).")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._medir(options["n"])
+                raise _Desfazer
+        except _Desfazer:
+            pass
+
+    def _criar_eventos(self, n):
+        modelo = Evento.objects.select_related("TIPO").first()
+        if modelo is None:
+            raise CommandError("Cadastre ao menos um evento (seed) antes de rodar o benchmark.")
+        hoje = timezone.localdate()
+        Evento.objects.bulk_create([
+            Evento(TIPO_id=modelo.TIPO_id, titulo=f"Evento de carga {i}", descricao="Descrição " * 20,
+                   data_inicio=hoje + timedelta(days=i % 365), data_fim=hoje + timedelta(days=i % 365 + 1),
+                   horario="19:00", local="Auditório Central", vagas=100,
+                   organizador_id=modelo.organizador_id, responsavel_id=modelo.responsavel_id,
+                   banner=f"banners/carga_{i}.png" if i % 2 else None)
+            for i in range(n)
+        ], batch_size=1000)
+
+    def _medir(self, n):
+        self._criar_eventos(n)
+        request = Request(RequestFactory().get("/api/eventos/", HTTP_HOST="localhost"))
+        base = Evento.objects.order_by("data_inicio", "id")
+
+        def via_serializer():
+            qs = EventoListSerializer.podar(base)[:n]
+            return EventoListSerializer(qs, many=True, context={"request": request}).data
+
+        def via_values():
+            linhas, montar = EventoListSerializer.linhas(base, request=request)
+            return [montar(linha) for linha in linhas[:n]]
+
+        resultados = {}
+        for nome, func in (("serializer DRF", via_serializer), ("caminho rápido", via_values)):
+            inicio = time.perf_counter()
+            dados = func()
+            resultados[nome] = (dados, time.perf_counter() - inicio)
+
+        if [dict(d) for d in resultados["serializer DRF"][0]] != resultados["caminho rápido"][0]:
+            self.stderr.write(self.style.ERROR("Saídas diferentes entre serializer e caminho rápido!"))
+
+        self.stdout.write(f"{n} eventos")
+        self.stdout.write("Montagem das linhas:")
+        base_taxa = None
+        for nome, (_, decorrido) in resultados.items():
+            taxa = n / decorrido
+            base_taxa = base_taxa or taxa
+            self.stdout.write(f"  {nome:<18} {taxa:>10.0f} linhas/s  ({taxa / base_taxa:.1f}x)")
+
+        dados = resultados["caminho rápido"][0]
+        renderizadores = [("JSONRenderer (DRF)", JSONRenderer())]
+        if orjson is not None:
+            renderizadores.append(("orjson", OrjsonRenderer()))
+        if msgpack is not None:
+            renderizadores.append(("MessagePack", MessagePackRenderer()))
+
+        self.stdout.write("Renderização:")
+        base_taxa = None
+        for nome, renderizador in renderizadores:
+            inicio = time.perf_counter()
+            corpo = renderizador.render(dados)
+            decorrido = time.perf_counter() - inicio
+            taxa = n / decorrido
+            base_taxa = base_taxa or taxa
+            self.stdout.write(f"  {nome:<18} {taxa:>10.0f} linhas/s  {len(corpo) / 1024:>8.0f} KiB  "
+                              f"({taxa / base_taxa:.1f}x)")
+        if orjson is None or msgpack is None:
+            self.stdout.write(self.style.WARNING("  (orjson/msgpack não instalados: renderizadores omitidos)"))
@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sgeaweb.pdf import renderizar_certificado, renderizar_certificado_completo, TEMPLATE_VERSAO
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark da geração de PDFs: Canvas completo x modelo pré-renderizado."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", type=int, default=1000, help="PDFs por medição (padrão: 1000).")
+
+    def handle(self, *args, **options):
+        n = options["n"]
+        hoje = timezone.now().date()
+        evento = SimpleNamespace(titulo="Semana Acadêmica de Tecnologia", data_inicio=hoje - timedelta(days=2),
+                                 data_fim=hoje, local="Auditório Central")
+        certs = [SimpleNamespace(codigo_validacao=f"BENCH{i:011d}", emitido_em=timezone.now())
+                 for i in range(n)]
+
+        # Aquece o modelo (construído uma vez por processo) antes de medir
+        renderizar_certificado(certs[0], "Participante", evento)
+
+        self.stdout.write(f"{n} PDFs por medição (TEMPLATE_VERSAO={TEMPLATE_VERSAO})")
+        base = None
+        for nome, func in (("Canvas completo (antes)", renderizar_certificado_completo),
+                           ("Modelo pré-renderizado (depois)", renderizar_certificado)):
+            inicio = time.perf_counter()
+            tamanho = 0
+            for i, cert in enumerate(certs):
+                tamanho += len(func(cert, f"Participante {i}", evento))
+            decorrido = time.perf_counter() - inicio
+
+            taxa = n / decorrido
+            base = base or taxa
+            self.stdout.write(
+                f"  {nome:<32} {taxa:>9.0f} PDFs/s  {tamanho / n / 1024:>6.1f} KiB/PDF  ({taxa / base:.1f}x)"
+            )
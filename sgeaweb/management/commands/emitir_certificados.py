@@ -1,34 +1,61 @@
-from django.core.management.base import BaseCommand
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from django.utils.crypto import get_random_string
 
-from sgeaweb.models import Evento, Inscricao, Certificado, Auditoria
+from sgeaweb.certificados import inscricoes_pendentes, emitir_pendentes
+from sgeaweb.models import Certificado
+from sgeaweb.pdf import renderizar_em_lote
 
 
 class Command(BaseCommand):
     help = "Emite certificados automaticamente para eventos já encerrados (presença confirmada)."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Só eventos encerrados a partir desta data (YYYY-MM-DD).")
+        parser.add_argument("--evento", type=int, help="Limita a emissão a um evento (ID).")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Inscrições por lote (padrão: 1000).")
+        parser.add_argument("--dry-run", action="store_true", help="Apenas conta as pendências, sem gravar.")
+        parser.add_argument("--sem-pdf", action="store_true",
+                            help="Não pré-gera os PDFs dos certificados emitidos (padrão: gera, em paralelo).")
+
     def handle(self, *args, **options):
-        hoje = timezone.now().date()
-        eventos = Evento.objects.filter(data_fim__lte=hoje)
-        total_emitidos = 0
-
-        for ev in eventos:
-            inscritos = Inscricao.objects.filter(evento=ev, presenca_confirmada=True)
-            for insc in inscritos:
-                cert, created = Certificado.objects.get_or_create(
-                    inscricao=insc,
-                    defaults={"codigo_validacao": get_random_string(16)}
-                )
-                if created:
-                    total_emitidos += 1
-                    try:
-                        Auditoria.objects.create(
-                            usuario=ev.organizador,
-                            acao="CERTIFICADO_GERADO_AUTO_CMD",
-                            descricao=f"Evento #{ev.id} - Inscrição #{insc.id} - Código {cert.codigo_validacao}"
-                        )
-                    except Exception:
-                        pass
-
-        self.stdout.write(self.style.SUCCESS(f"Certificados emitidos: {total_emitidos}"))
+        since = None
+        if options["since"]:
+            try:
+                since = date.fromisoformat(options["since"])
+            except ValueError:
+                raise CommandError("Data inválida em --since (use YYYY-MM-DD).")
+
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size deve ser maior que zero.")
+
+        qs = inscricoes_pendentes(since=since, evento_id=options["evento"])
+        marco = timezone.now()
+        inicio = time.monotonic()
+
+        def progresso(lidos, emitidos):
+            decorrido = time.monotonic() - inicio
+            taxa = lidos / decorrido if decorrido else 0
+            self.stdout.write(f"  {lidos} inscrições processadas, {emitidos} emitidas ({taxa:.0f}/s)")
+
+        lidos, emitidos = emitir_pendentes(
+            qs, chunk_size=chunk_size, dry_run=options["dry_run"], progresso=progresso
+        )
+
+        decorrido = time.monotonic() - inicio
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"[dry-run] Certificados pendentes: {lidos}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Certificados emitidos: {emitidos} (em {decorrido:.2f}s)"
+            ))
+            if emitidos and not options["sem_pdf"]:
+                # PDFs prontos no cache: o download e o ZIP da view só leem arquivos
+                novos = (Certificado.objects.filter(emitido_em__gte=marco)
+                         .select_related("inscricao__participante", "inscricao__evento")
+                         .order_by("id").iterator(chunk_size=500))
+                gerados = sum(1 for _ in renderizar_em_lote(novos))
+                self.stdout.write(f"  PDFs pré-gerados: {gerados}")
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sgeaweb.caixa_saida import enviar_lote, resumo
+
+
+class Command(BaseCommand):
+    help = ("Entrega os e-mails da caixa de saída em lotes, uma conexão SMTP por lote, com novas tentativas "
+            "espaçadas. Sem --continuo, esvazia o que estiver pronto e termina (bom para cron).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=getattr(settings, "EMAIL_SAIDA_LOTE", 100),
+                            help="E-mails por lote (padrão: EMAIL_SAIDA_LOTE).")
+        parser.add_argument("--continuo", action="store_true", help="Fica rodando, consultando a fila.")
+        parser.add_argument("--intervalo", type=float, default=5.0,
+                            help="Segundos entre consultas com a fila vazia (com --continuo; padrão: 5).")
+        parser.add_argument("--resumo", action="store_true", help="Só mostra a quantidade por status.")
+
+    def handle(self, *args, **options):
+        if options["resumo"]:
+            for status, n in resumo().items():
+                self.stdout.write(f"  {status:<9} {n}")
+            return
+
+        lote = options["lote"]
+        if lote < 1:
+            raise CommandError("--lote deve ser maior que zero.")
+
+        total_enviados = total_falhas = 0
+        try:
+            while True:
+                inicio = time.monotonic()
+                enviados, falhas = enviar_lote(lote)
+                if enviados or falhas:
+                    total_enviados += enviados
+                    total_falhas += falhas
+                    self.stdout.write(f"  lote: {enviados} enviados, {falhas} com falha "
+                                      f"({time.monotonic() - inicio:.2f}s)")
+                if enviados + falhas >= lote:
+                    continue  # pode haver mais na fila
+                if not options["continuo"]:
+                    break
+                time.sleep(options["intervalo"])
+        except KeyboardInterrupt:
+            pass
+
+        estilo = self.style.SUCCESS if not total_falhas else self.style.WARNING
+        self.stdout.write(estilo(f"E-mails enviados: {total_enviados}; falhas (reagendadas ou esgotadas): {total_falhas}"))
@@ -0,0 +1,66 @@
+import itertools
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sgeaweb.api.views import EventoListAPI
+from sgeaweb.eventos import filtrar
+
+# Um valor de exemplo por filtro da API (o plano não depende dos valores)
+EXEMPLOS = {
+    "desde": date(2025, 1, 1),
+    "ate": date(2025, 12, 31),
+    "tipo": 1,
+    "local": "Auditório 1",
+    "organizador": 1,
+    "responsavel": 1,
+    "com_vagas": True,
+}
+
+
+def usa_indice(plano):
+    """True se toda leitura de `evento` no plano é busca (SEARCH) num índice e nada é ordenado em memória.
+
+    "SCAN ... USING INDEX" não conta: é a tabela inteira, só que na ordem do índice.
+    """
+    if "TEMP B-TREE" in plano:
+        return False
+    leituras = [linha for linha in plano.splitlines() if "evento" in linha and ("SCAN" in linha or "SEARCH" in linha)]
+    return bool(leituras) and all("SEARCH" in linha and "INDEX" in linha for linha in leituras)
+
+
+def sem_ordenacao(plano):
+    """Sem filtros a tabela é lida inteira; basta que venha na ordem do índice."""
+    return "TEMP B-TREE" not in plano and "USING INDEX" in plano
+
+
+def planos(base):
+    """(nomes dos filtros, EXPLAIN QUERY PLAN) de cada combinação de filtros, começando sem nenhum."""
+    for n in range(len(EXEMPLOS) + 1):
+        for nomes in itertools.combinations(EXEMPLOS, n):
+            yield nomes, filtrar(base.all(), **{nome: EXEMPLOS[nome] for nome in nomes}).explain()
+
+
+class Command(BaseCommand):
+    help = ("Confere com EXPLAIN (QUERY PLAN) que toda combinação de filtros de /api/eventos/ é uma busca "
+            "(SEARCH) em índice, sem ordenação em memória (TEMP B-TREE).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plan", action="store_true", help="Mostra o plano de cada combinação.")
+
+    def handle(self, *args, **options):
+        base = EventoListAPI.queryset
+        falhas = []
+        total = 0
+        for nomes, plano in planos(base):
+            total += 1
+            rotulo = ", ".join(nomes) or "(sem filtros)"
+            ok = usa_indice(plano) if nomes else sem_ordenacao(plano)
+            if not ok:
+                falhas.append(rotulo)
+            if options["verbose_plan"] or not ok:
+                self.stdout.write(f"{rotulo}:\n  " + plano.replace("\n", "\n  "))
+
+        if falhas:
+            raise CommandError(f"{len(falhas)} de {total} combinações sem busca em índice: " + "; ".join(falhas))
+        self.stdout.write(self.style.SUCCESS(f"{total} combinações de filtros conferidas: todas com busca em índice."))
@@ -0,0 +1,38 @@
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sgeaweb.auditoria import consultar, exportar_linhas, FORMATOS_EXPORTACAO
+
+
+class Command(BaseCommand):
+    help = "Exporta o log de auditoria filtrado em CSV ou JSON Lines (streaming)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--formato", choices=sorted(FORMATOS_EXPORTACAO), default="csv")
+        parser.add_argument("--desde", help="Data inicial (YYYY-MM-DD), inclusive.")
+        parser.add_argument("--ate", help="Data final (YYYY-MM-DD), inclusive.")
+        parser.add_argument("--usuario", help="Username exato.")
+        parser.add_argument("--saida", help="Arquivo de saída (padrão: stdout).")
+
+    def handle(self, *args, **options):
+        try:
+            filtros = {campo: date.fromisoformat(options[campo])
+                       for campo in ("desde", "ate") if options[campo]}
+        except ValueError:
+            raise CommandError("Data inválida (use YYYY-MM-DD).")
+
+        qs = consultar(usuario=options["usuario"], **filtros)
+        saida = open(options["saida"], "w", encoding="utf-8", newline="") if options["saida"] else sys.stdout
+        total = 0
+        try:
+            for linha in exportar_linhas(qs, options["formato"]):
+                saida.write(linha)
+                total += 1
+        finally:
+            if saida is not sys.stdout:
+                saida.close()
+
+        if options["saida"]:
+            self.stdout.write(self.style.SUCCESS(f"{total} linha(s) gravada(s) em {options['saida']}"))
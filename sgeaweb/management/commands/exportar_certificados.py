@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sgeaweb.models import Evento
+from sgeaweb.pdf import zip_certificados_do_evento
+
+
+class Command(BaseCommand):
+    help = "Gera um ZIP com os PDFs de todos os certificados de um evento (renderização em paralelo)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("evento", type=int, help="ID do evento.")
+        parser.add_argument("--saida", help="Arquivo ZIP de saída (padrão: certificados_evento_<ID>.zip).")
+        parser.add_argument("--processos", type=int, help="Processos de renderização (padrão: nº de CPUs).")
+
+    def handle(self, *args, **options):
+        try:
+            ev = Evento.objects.get(pk=options["evento"])
+        except Evento.DoesNotExist:
+            raise CommandError("Evento não encontrado.")
+
+        saida = options["saida"] or f"certificados_evento_{ev.id}.zip"
+        inicio = time.monotonic()
+        total = 0
+        with open(saida, "wb") as f:
+            for parte in zip_certificados_do_evento(ev.id, pool=True, processos=options["processos"]):
+                f.write(parte)
+                total += len(parte)
+
+        decorrido = time.monotonic() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"ZIP gerado: {saida} ({total / 1024:.0f} KiB em {decorrido:.2f}s)"
+        ))
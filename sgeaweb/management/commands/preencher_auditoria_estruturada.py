@@ -0,0 +1,90 @@
+import re
+import time
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+
+from sgeaweb.models import Auditoria, AcaoAuditoria, Evento, Inscricao
+
+A = AcaoAuditoria
+
+# Como extrair o alvo de registros antigos, que só tinham o texto da descrição
+EXTRATORES = {
+    A.CADASTRAR_EVENTO: (Evento, re.compile(r"\(ID (\d+)\)")),
+    A.ALTERAR_EVENTO: (Evento, re.compile(r"\(ID (\d+)\)")),
+    A.EXCLUIR_EVENTO: (Evento, re.compile(r"\(ID (\d+)\)")),
+    A.INSCRICAO_EVENTO: (Evento, re.compile(r"evento ID (\d+)")),
+    A.EXPORTAR_CERTIFICADOS_ZIP: (Evento, re.compile(r"evento ID (\d+)")),
+    A.API_INSCRICAO_EVENTO: (Evento, re.compile(r"no evento (\d+)")),
+    A.GERAR_CERTIFICADO: (Inscricao, re.compile(r"inscrição #?(\d+)", re.IGNORECASE)),
+    A.CONSULTAR_CERTIFICADO: (Inscricao, re.compile(r"inscrição (\d+)")),
+    A.BAIXAR_CERTIFICADO_PDF: (Inscricao, re.compile(r"inscrição (\d+)")),
+    A.CERTIFICADO_GERADO_AUTO: (Inscricao, re.compile(r"Inscrição #(\d+)")),
+    A.CERTIFICADO_GERADO_AUTO_CMD: (Inscricao, re.compile(r"Inscrição #(\d+)")),
+    # O próprio usuário é o alvo
+    A.CRIAR_USUARIO: (User, None),
+    A.CONFIRMAR_EMAIL: (User, None),
+}
+EVENTO_NO_LOTE = re.compile(r"Evento #(\d+)")
+CODIGO_NO_LOTE = re.compile(r"Código (\w+)")
+
+
+class Command(BaseCommand):
+    help = "Preenche alvo_tipo/alvo_id/dados dos registros de auditoria antigos a partir da descrição."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Registros por bloco (padrão: 2000).")
+        parser.add_argument("--dry-run", action="store_true", help="Apenas conta quantos seriam preenchidos.")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size deve ser maior que zero.")
+
+        tipos = {modelo: ContentType.objects.get_for_model(modelo) for modelo in (Evento, Inscricao, User)}
+        pendentes = (Auditoria.objects
+                     .filter(alvo_tipo__isnull=True, acao__in=list(EXTRATORES))
+                     .order_by("id")
+                     .only("id", "acao", "descricao", "usuario_id"))
+
+        inicio = time.monotonic()
+        ultimo_id = lidos = preenchidos = 0
+        while True:
+            # Keyset por id: cada bloco é uma consulta curta pelo índice da PK
+            bloco = list(pendentes.filter(id__gt=ultimo_id)[:chunk_size])
+            if not bloco:
+                break
+            ultimo_id = bloco[-1].id
+            lidos += len(bloco)
+
+            alterados = [r for r in bloco if self._preencher(r, tipos)]
+            if alterados and not options["dry_run"]:
+                Auditoria.objects.bulk_update(alterados, ["alvo_tipo", "alvo_id", "dados"])
+            preenchidos += len(alterados)
+            self.stdout.write(f"  {lidos} lidos, {preenchidos} preenchidos "
+                              f"({lidos / (time.monotonic() - inicio):.0f}/s)")
+
+        prefixo = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefixo}Registros lidos: {lidos}. Preenchidos: {preenchidos}. "
+            f"({time.monotonic() - inicio:.2f}s)"
+        ))
+
+    def _preencher(self, registro, tipos):
+        modelo, padrao = EXTRATORES[registro.acao]
+        if padrao is None:
+            alvo_id = registro.usuario_id
+        else:
+            achado = padrao.search(registro.descricao)
+            alvo_id = int(achado.group(1)) if achado else None
+        if alvo_id is None:
+            return False
+
+        registro.alvo_tipo = tipos[modelo]
+        registro.alvo_id = alvo_id
+        evento = EVENTO_NO_LOTE.search(registro.descricao)
+        codigo = CODIGO_NO_LOTE.search(registro.descricao)
+        if evento and codigo:
+            registro.dados = {"evento": int(evento.group(1)), "codigo": codigo.group(1)}
+        return True
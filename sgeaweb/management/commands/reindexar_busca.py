@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from sgeaweb import busca
+
+
+class Command(BaseCommand):
+    help = "Recria o índice de busca textual de eventos (FTS5) a partir das tabelas."
+
+    def handle(self, *args, **options):
+        if not busca.suportado():
+            raise CommandError(f"Busca FTS5 disponível apenas no SQLite (banco atual: {connection.vendor}).")
+
+        with transaction.atomic():
+            total = busca.reindexar()
+        self.stdout.write(self.style.SUCCESS(f"Eventos indexados: {total}"))
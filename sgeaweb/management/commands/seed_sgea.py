@@ -3,7 +3,10 @@ from datetime import timedelta
 
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
 from django.utils import timezone
+from django.utils.crypto import get_random_string
+from rest_framework.authtoken.models import Token
 
 from sgeaweb.models import PerfilUsuario, Evento, TipoEvento
 
@@ -11,12 +14,16 @@ from sgeaweb.models import PerfilUsuario, Evento, TipoEvento
 class Command(BaseCommand):
     help = "Cria usuários iniciais para testes do SGEA (organizador, aluno e professor)."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--senha", help="Senha dos usuários criados (padrão: uma aleatória por usuário, exibida).")
+        parser.add_argument("--rotacionar", action="store_true",
+                            help="Troca a senha dos usuários que já existem e revoga seus tokens e sessões.")
+
     def handle(self, *args, **options):
         usuarios = [
             {
                 "username": "organizador@sgea.com",
                 "email": "organizador@sgea.com",
-                "password": "Admin@123",
                 "first_name": "Usuário",
                 "last_name": "Organizador",
                 "perfil": "ORGANIZADOR",
@@ -25,7 +32,6 @@ class Command(BaseCommand):
             {
                 "username": "aluno@sgea.com",
                 "email": "aluno@sgea.com",
-                "password": "Aluno@123",
                 "first_name": "Usuário",
                 "last_name": "Aluno",
                 "perfil": "ALUNO",
@@ -34,7 +40,6 @@ class Command(BaseCommand):
             {
                 "username": "professor@sgea.com",
                 "email": "professor@sgea.com",
-                "password": "Professor@123",
                 "first_name": "Usuário",
                 "last_name": "Professor",
                 "perfil": "PROFESSOR",
@@ -45,7 +50,8 @@ class Command(BaseCommand):
         for dados in usuarios:
             username = dados["username"]
             email = dados["email"]
-            password = dados["password"]
+            # Sem senha fixa no código: uma senha conhecida vale em todo banco em que o seed rodou
+            password = options["senha"] or get_random_string(12) + "@1"
             first_name = dados["first_name"]
             last_name = dados["last_name"]
             perfil_tipo = dados["perfil"]
@@ -68,9 +74,18 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.SUCCESS(f"Usuário criado: {username} / senha: {password}")
                 )
+            elif options["rotacionar"]:
+                user.set_password(password)
+                user.save()
+                Token.objects.filter(user=user).delete()
+                sessoes = [s.pk for s in Session.objects.iterator() if s.get_decoded().get("_auth_user_id") == str(user.pk)]
+                Session.objects.filter(pk__in=sessoes).delete()
+                self.stdout.write(
+                    self.style.SUCCESS(f"Senha trocada: {username} / senha: {password} (tokens e sessões revogados)")
+                )
             else:
                 self.stdout.write(
-                    self.style.WARNING(f"Usuário já existia: {username} (senha não alterada).")
+                    self.style.WARNING(f"Usuário já existia: {username} (senha não alterada; use --rotacionar).")
                 )
 
             #   CRIA OU ATUALIZA PERFIL
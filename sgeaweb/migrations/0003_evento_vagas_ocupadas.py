@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:52
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def preencher_vagas_ocupadas(apps, schema_editor):
+    Evento = apps.get_model("sgeaweb", "Evento")
+    for ev in Evento.objects.annotate(total=Count("inscricao")).filter(total__gt=0):
+        Evento.objects.filter(pk=ev.pk).update(vagas_ocupadas=ev.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0002_evento_banner_inscricao_presenca_confirmada_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evento",
+            name="vagas_ocupadas",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(preencher_vagas_ocupadas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:59
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0003_evento_vagas_ocupadas"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditoria",
+            name="data_hora",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
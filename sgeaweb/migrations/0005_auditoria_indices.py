@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0004_auditoria_data_hora_default"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="auditoria",
+            index=models.Index(fields=["data_hora"], name="auditoria_data_hora_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="auditoria",
+            index=models.Index(fields=["usuario", "data_hora"], name="auditoria_usuario_data_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="auditoria",
+            index=models.Index(fields=["acao", "data_hora"], name="auditoria_acao_data_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0005_auditoria_indices"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="auditoria",
+            options={"verbose_name": "Registro de Auditoria", "verbose_name_plural": "Registros de Auditoria"},
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("sgeaweb", "0006_auditoria_sem_ordering"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="auditoria",
+            name="alvo_id",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="auditoria",
+            name="alvo_tipo",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to="contenttypes.contenttype"),
+        ),
+        migrations.AddField(
+            model_name="auditoria",
+            name="dados",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="auditoria",
+            name="acao",
+            field=models.CharField(choices=[("LOGIN", "Login"), ("LOGOUT", "Logout"), ("CRIAR_USUARIO", "Criação de usuário"), ("CONFIRMAR_EMAIL", "Confirmação de e-mail"), ("CADASTRAR_EVENTO", "Cadastro de evento"), ("ALTERAR_EVENTO", "Alteração de evento"), ("EXCLUIR_EVENTO", "Exclusão de evento"), ("INSCRICAO_EVENTO", "Inscrição em evento"), ("API_INSCRICAO_EVENTO", "Inscrição via API"), ("API_CONSULTA_EVENTOS", "Consulta de eventos via API"), ("GERAR_CERTIFICADO", "Emissão manual de certificado"), ("CERTIFICADO_GERADO_AUTO", "Emissão automática de certificado"), ("CERTIFICADO_GERADO_AUTO_CMD", "Emissão de certificado em lote"), ("CONSULTAR_CERTIFICADO", "Consulta de certificado"), ("BAIXAR_CERTIFICADO_PDF", "Download de certificado (PDF)"), ("EXPORTAR_CERTIFICADOS_ZIP", "Exportação de certificados (ZIP)"), ("EXPORTAR_AUDITORIA", "Exportação da auditoria")], max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name="auditoria",
+            index=models.Index(fields=["alvo_tipo", "alvo_id", "data_hora"], name="auditoria_alvo_data_idx"),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0007_auditoria_estruturada"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["data_inicio", "id"], name="evento_inicio_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["data_fim"], name="evento_data_fim_idx"),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:20
+
+from django.db import migrations
+
+# SQL fixo aqui (e não importado de sgeaweb/busca.py): mudar o módulo não muda o que esta migração faz
+SQL_CRIAR = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS evento_busca USING fts5(
+        titulo, descricao, local, tipo, tokenize = 'unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS evento_busca_ai AFTER INSERT ON evento BEGIN
+        INSERT INTO evento_busca(rowid, titulo, descricao, local, tipo)
+        SELECT new.id, new.titulo, new.descricao, new.local, t.nome
+        FROM tipo_evento t WHERE t.id = new.TIPO_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS evento_busca_au AFTER UPDATE OF titulo, descricao, local, TIPO_id ON evento BEGIN
+        DELETE FROM evento_busca WHERE rowid = old.id;
+        INSERT INTO evento_busca(rowid, titulo, descricao, local, tipo)
+        SELECT new.id, new.titulo, new.descricao, new.local, t.nome
+        FROM tipo_evento t WHERE t.id = new.TIPO_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS evento_busca_ad AFTER DELETE ON evento BEGIN
+        DELETE FROM evento_busca WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS evento_busca_tipo_au AFTER UPDATE OF nome ON tipo_evento BEGIN
+        UPDATE evento_busca SET tipo = new.nome
+        WHERE rowid IN (SELECT id FROM evento WHERE TIPO_id = new.id);
+    END""",
+    """INSERT INTO evento_busca(rowid, titulo, descricao, local, tipo)
+        SELECT e.id, e.titulo, e.descricao, e.local, t.nome
+        FROM evento e JOIN tipo_evento t ON t.id = e.TIPO_id""",
+]
+
+SQL_REMOVER = [
+    "DROP TRIGGER IF EXISTS evento_busca_tipo_au",
+    "DROP TRIGGER IF EXISTS evento_busca_ad",
+    "DROP TRIGGER IF EXISTS evento_busca_au",
+    "DROP TRIGGER IF EXISTS evento_busca_ai",
+    "DROP TABLE IF EXISTS evento_busca",
+]
+
+
+def criar_indice(apps, schema_editor):
+    # FTS5 só existe no SQLite; nos outros bancos a busca cai para icontains
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in SQL_CRIAR:
+            schema_editor.execute(sql)
+
+
+def remover_indice(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in SQL_REMOVER:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0008_evento_indices_vitrine"),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice, remover_indice),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0009_evento_busca_fts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["data_inicio", "data_fim"], name="evento_periodo_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["organizador", "data_inicio"], name="evento_org_inicio_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["TIPO", "data_inicio"], name="evento_tipo_inicio_idx"),
+        ),
+    ]
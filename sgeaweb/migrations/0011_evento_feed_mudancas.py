@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:10
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0010_evento_indices_filtros"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventoRemovido",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("evento_id", models.PositiveBigIntegerField()),
+                ("removido_em", models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+            ],
+            options={
+                "verbose_name": "Evento removido",
+                "verbose_name_plural": "Eventos removidos",
+                "db_table": "evento_removido",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["atualizado_em", "id"], name="evento_atualizado_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0011_evento_feed_mudancas"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailSaida",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("assunto", models.CharField(max_length=200)),
+                ("remetente", models.CharField(max_length=254)),
+                ("destinatarios", models.JSONField()),
+                ("corpo", models.TextField(blank=True)),
+                ("html", models.TextField(blank=True)),
+                ("status", models.CharField(choices=[("PENDENTE", "Pendente"), ("ENVIANDO", "Enviando"), ("ENVIADO", "Enviado"), ("FALHOU", "Falhou")], default="PENDENTE", max_length=10)),
+                ("tentativas", models.PositiveSmallIntegerField(default=0)),
+                ("proxima_tentativa", models.DateTimeField(default=django.utils.timezone.now)),
+                ("lote", models.CharField(blank=True, max_length=32)),
+                ("reservado_ate", models.DateTimeField(blank=True, null=True)),
+                ("erro", models.TextField(blank=True)),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+                ("enviado_em", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "E-mail na caixa de saída",
+                "verbose_name_plural": "Caixa de saída (e-mails)",
+                "db_table": "email_saida",
+                "indexes": [models.Index(fields=["status", "proxima_tentativa"], name="email_saida_fila_idx"), models.Index(fields=["lote"], name="email_saida_lote_idx")],
+            },
+        ),
+    ]
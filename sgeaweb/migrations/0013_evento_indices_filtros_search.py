@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:29
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0012_email_saida"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="evento",
+            name="evento_data_fim_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="evento",
+            name="evento_periodo_idx",
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["data_fim", "data_inicio"], name="evento_fim_inicio_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(fields=["responsavel", "data_inicio"], name="evento_resp_inicio_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(django.db.models.functions.comparison.Collate("local", "NOCASE"), models.F("data_inicio"), name="evento_local_inicio_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(models.ExpressionWrapper(models.Q(("vagas_ocupadas__lt", models.F("vagas"))), output_field=models.IntegerField()), models.F("data_inicio"), models.F("id"), name="evento_vaga_inicio_idx"),
+        ),
+    ]
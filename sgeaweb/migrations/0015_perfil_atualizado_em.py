@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sgeaweb", "0013_evento_indices_filtros_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="perfilusuario",
+            name="atualizado_em",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
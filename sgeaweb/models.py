@@ -1,5 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.functions import Collate
+from django.utils import timezone
 
 
 class TipoEvento(models.Model):
@@ -36,6 +40,9 @@ class PerfilUsuario(models.Model):
     email_confirmado = models.BooleanField(default=False)
     confirma_token = models.CharField(max_length=64, blank=True, null=True)
 
+    # Versão do papel guardado nas sessões (sgeaweb/papeis.py)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
     class Meta:
         db_table = "perfil_usuario"
         verbose_name = "Perfil de Usuário"
@@ -45,6 +52,10 @@ class PerfilUsuario(models.Model):
         return f"{self.user.get_full_name() or self.user.username} - {self.perfil}"
 
 
+# 1 se o evento ainda tem vaga; a mesma expressão do índice evento_vaga_inicio_idx
+TEM_VAGA = models.ExpressionWrapper(models.Q(vagas_ocupadas__lt=models.F("vagas")), output_field=models.IntegerField())
+
+
 class Evento(models.Model):
     """Evento acadêmico que pode receber inscrições."""
     TIPO = models.ForeignKey(TipoEvento, on_delete=models.PROTECT)
@@ -55,6 +66,8 @@ class Evento(models.Model):
     horario = models.CharField(max_length=50)
     local = models.CharField(max_length=200)
     vagas = models.PositiveIntegerField()
+    # Contador mantido pelo motor de reservas (sgeaweb/reservas.py)
+    vagas_ocupadas = models.PositiveIntegerField(default=0, editable=False)
 
     organizador = models.ForeignKey(
         User,
@@ -84,12 +97,56 @@ class Evento(models.Model):
     class Meta:
         db_table = "evento"
         ordering = ["-data_inicio", "titulo"]
+        indexes = [
+            # Vitrine da home: ordem/keyset por (data_inicio, id) e filtro de próximos por data_fim
+            models.Index(fields=["data_inicio", "id"], name="evento_inicio_id_idx"),
+            # Limite inferior de data_inicio para "termina a partir de" (sgeaweb/eventos.py: terminam_desde)
+            models.Index(fields=["data_fim", "data_inicio"], name="evento_fim_inicio_idx"),
+            # Filtros da API (sgeaweb/eventos.py: filtrar): igualdade + data_inicio, sem ordenação extra
+            models.Index(fields=["organizador", "data_inicio"], name="evento_org_inicio_idx"),
+            models.Index(fields=["TIPO", "data_inicio"], name="evento_tipo_inicio_idx"),
+            models.Index(fields=["responsavel", "data_inicio"], name="evento_resp_inicio_idx"),
+            models.Index(Collate("local", "NOCASE"), "data_inicio", name="evento_local_inicio_idx"),
+            models.Index(TEM_VAGA, "data_inicio", "id", name="evento_vaga_inicio_idx"),
+            # Feed de mudanças (/api/eventos/changes/)
+            models.Index(fields=["atualizado_em", "id"], name="evento_atualizado_idx"),
+        ]
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
 
     def __str__(self):
         return self.titulo
 
+    def save(self, *args, **kwargs):
+        # O contador só muda por UPDATE com F() (sgeaweb/reservas.py): um save() comum de uma instância
+        # carregada antes regravaria o valor antigo e apagaria as reservas feitas nesse meio-tempo
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [f.name for f in self._meta.concrete_fields
+                                       if not f.primary_key and f.name != "vagas_ocupadas"]
+        super().save(*args, **kwargs)
+
+    @property
+    def vagas_restantes(self):
+        return max(self.vagas - self.vagas_ocupadas, 0)
+
+    @property
+    def lotado(self):
+        return self.vagas_ocupadas >= self.vagas
+
+
+class EventoRemovido(models.Model):
+    """Lápide de evento excluído, para o feed de mudanças da API (gravada por signal)."""
+    evento_id = models.PositiveBigIntegerField()
+    removido_em = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        db_table = "evento_removido"
+        verbose_name = "Evento removido"
+        verbose_name_plural = "Eventos removidos"
+
+    def __str__(self):
+        return f"Evento #{self.evento_id} removido em {self.removido_em:%d/%m/%Y %H:%M}"
+
 
 class Inscricao(models.Model):
     participante = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -123,18 +180,90 @@ class Certificado(models.Model):
         return f"Certificado {self.codigo_validacao}"
 
 
+class AcaoAuditoria(models.TextChoices):
+    """Códigos das ações registradas na auditoria."""
+    LOGIN = "LOGIN", "Login"
+    LOGOUT = "LOGOUT", "Logout"
+    CRIAR_USUARIO = "CRIAR_USUARIO", "Criação de usuário"
+    CONFIRMAR_EMAIL = "CONFIRMAR_EMAIL", "Confirmação de e-mail"
+    CADASTRAR_EVENTO = "CADASTRAR_EVENTO", "Cadastro de evento"
+    ALTERAR_EVENTO = "ALTERAR_EVENTO", "Alteração de evento"
+    EXCLUIR_EVENTO = "EXCLUIR_EVENTO", "Exclusão de evento"
+    INSCRICAO_EVENTO = "INSCRICAO_EVENTO", "Inscrição em evento"
+    API_INSCRICAO_EVENTO = "API_INSCRICAO_EVENTO", "Inscrição via API"
+    API_CONSULTA_EVENTOS = "API_CONSULTA_EVENTOS", "Consulta de eventos via API"
+    GERAR_CERTIFICADO = "GERAR_CERTIFICADO", "Emissão manual de certificado"
+    CERTIFICADO_GERADO_AUTO = "CERTIFICADO_GERADO_AUTO", "Emissão automática de certificado"
+    CERTIFICADO_GERADO_AUTO_CMD = "CERTIFICADO_GERADO_AUTO_CMD", "Emissão de certificado em lote"
+    CONSULTAR_CERTIFICADO = "CONSULTAR_CERTIFICADO", "Consulta de certificado"
+    BAIXAR_CERTIFICADO_PDF = "BAIXAR_CERTIFICADO_PDF", "Download de certificado (PDF)"
+    EXPORTAR_CERTIFICADOS_ZIP = "EXPORTAR_CERTIFICADOS_ZIP", "Exportação de certificados (ZIP)"
+    EXPORTAR_AUDITORIA = "EXPORTAR_AUDITORIA", "Exportação da auditoria"
+
+
 class Auditoria(models.Model):
     """Item 10 — Logs de ações sensíveis realizadas no sistema."""
     usuario = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
-    acao = models.CharField(max_length=200)
+    acao = models.CharField(max_length=200, choices=AcaoAuditoria.choices)
     descricao = models.TextField()
-    data_hora = models.DateTimeField(auto_now_add=True)
+    # Preenchido no momento da ação (a gravação em lote pode ocorrer depois)
+    data_hora = models.DateTimeField(default=timezone.now, editable=False)
+
+    # Campos estruturados: objeto afetado + dados extras pequenos (consultas agregadas sem LIKE)
+    alvo_tipo = models.ForeignKey(ContentType, on_delete=models.SET_NULL, null=True, blank=True)
+    alvo_id = models.PositiveBigIntegerField(null=True, blank=True)
+    alvo = GenericForeignKey("alvo_tipo", "alvo_id")
+    dados = models.JSONField(null=True, blank=True)
 
     class Meta:
         db_table = "auditoria"
-        ordering = ["-data_hora"]
+        # Sem ordering padrão: consultas sem filtro não ordenam a tabela inteira
+        indexes = [
+            models.Index(fields=["data_hora"], name="auditoria_data_hora_idx"),
+            models.Index(fields=["usuario", "data_hora"], name="auditoria_usuario_data_idx"),
+            models.Index(fields=["acao", "data_hora"], name="auditoria_acao_data_idx"),
+            models.Index(fields=["alvo_tipo", "alvo_id", "data_hora"], name="auditoria_alvo_data_idx"),
+        ]
         verbose_name = "Registro de Auditoria"
         verbose_name_plural = "Registros de Auditoria"
 
     def __str__(self):
         return f"{self.usuario} - {self.acao} - {self.data_hora.strftime('%d/%m/%Y %H:%M')}"
+
+
+class StatusEmail(models.TextChoices):
+    PENDENTE = "PENDENTE", "Pendente"
+    ENVIANDO = "ENVIANDO", "Enviando"
+    ENVIADO = "ENVIADO", "Enviado"
+    FALHOU = "FALHOU", "Falhou"
+
+
+class EmailSaida(models.Model):
+    """Caixa de saída: e-mails enfileirados pelas views e enviados pelo comando `enviar_emails`."""
+    assunto = models.CharField(max_length=200)
+    remetente = models.CharField(max_length=254)
+    destinatarios = models.JSONField()
+    corpo = models.TextField(blank=True)
+    html = models.TextField(blank=True)
+
+    status = models.CharField(max_length=10, choices=StatusEmail.choices, default=StatusEmail.PENDENTE)
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    proxima_tentativa = models.DateTimeField(default=timezone.now)
+    # Reserva do worker: lote que pegou o e-mail e até quando (worker que morre libera ao expirar)
+    lote = models.CharField(max_length=32, blank=True)
+    reservado_ate = models.DateTimeField(null=True, blank=True)
+    erro = models.TextField(blank=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    enviado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_saida"
+        indexes = [
+            models.Index(fields=["status", "proxima_tentativa"], name="email_saida_fila_idx"),
+            models.Index(fields=["lote"], name="email_saida_lote_idx"),
+        ]
+        verbose_name = "E-mail na caixa de saída"
+        verbose_name_plural = "Caixa de saída (e-mails)"
+
+    def __str__(self):
+        return f"{self.assunto} → {', '.join(self.destinatarios)} ({self.status})"
@@ -0,0 +1,105 @@
+"""Papel do usuário (perfil e e-mail confirmado), resolvido uma vez por requisição.
+
+`papel(user)` é o único acesso ao perfil para views, permissões da API e
+templates (variável `papel`, via context processor). Nas requisições com
+sessão o `PapelMiddleware` lê o papel guardado na sessão; sem sessão (API
+por token) ele vem de `user.perfil`, que `BackendComPerfil` e a autenticação
+da API já carregam junto com o usuário.
+
+A sessão guarda também a versão do papel: `PerfilUsuario.atualizado_em`,
+que chega junto com o usuário (select_related). Salvar o perfil muda a
+versão e as sessões abertas recarregam o papel na requisição seguinte, em
+qualquer worker; a sessão só é regravada quando o perfil muda.
+"""
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.middleware import get_user
+from django.utils.functional import SimpleLazyObject
+
+SESSAO = "_sgea_papel"
+
+ORGANIZADOR = "ORGANIZADOR"
+PARTICIPANTES = ("ALUNO", "PROFESSOR")
+
+
+class Papel(namedtuple("Papel", "perfil email_confirmado")):
+    __slots__ = ()
+
+    @property
+    def organizador(self):
+        return self.perfil == ORGANIZADOR
+
+    @property
+    def participante(self):
+        return self.perfil in PARTICIPANTES
+
+
+ANONIMO = Papel(None, False)
+SEM_PERFIL = Papel("SEM_PERFIL", False)
+
+
+def _do_banco(user):
+    perfil = getattr(user, "perfil", None)  # RelatedObjectDoesNotExist é um AttributeError
+    if perfil is None:
+        return SEM_PERFIL
+    return Papel(perfil.perfil, perfil.email_confirmado)
+
+
+def papel(user):
+    """Papel de `user`; calculado uma vez e guardado na própria instância."""
+    if user is None or not user.is_authenticated:
+        return ANONIMO
+    atual = getattr(user, "_papel", None)
+    if atual is None:
+        atual = user._papel = _do_banco(user)
+    return atual
+
+
+def versao(user):
+    """Versão do papel de `user` (sem consulta: o perfil vem com o usuário)."""
+    perfil = getattr(user, "perfil", None)
+    return perfil.atualizado_em.isoformat() if perfil is not None else "-"
+
+
+def _resolver(request):
+    user = get_user(request)
+    if not user.is_authenticated:
+        return user
+
+    atual = versao(user)
+    guardado = request.session.get(SESSAO)
+    if guardado and guardado[0] == atual:
+        user._papel = Papel(*guardado[1:])
+    else:
+        valor = papel(user)
+        request.session[SESSAO] = [atual, *valor]
+    return user
+
+
+class PapelMiddleware:
+    """Depois do AuthenticationMiddleware: anexa ao `request.user` o papel guardado na sessão."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(lambda: _resolver(request))
+        return self.get_response(request)
+
+
+class BackendComPerfil(ModelBackend):
+    """ModelBackend que carrega o perfil na mesma consulta do usuário da sessão."""
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related("perfil").get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def context_processor(request):
+    return {"papel": papel(getattr(request, "user", None))}
@@ -0,0 +1,320 @@
+"""Geração e cache dos PDFs de certificado (Item 8).
+
+O PDF de um certificado só muda se o layout (TEMPLATE_VERSAO), o nome do
+participante ou os dados do evento mudarem. Por isso o arquivo renderizado
+fica guardado em MEDIA_ROOT/certificados/v<versão>/<codigo_validacao>.pdf e
+é apagado pelos signals quando usuário ou evento são alterados.
+"""
+import functools
+import os
+import re
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import django
+from django.conf import settings
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib.rl_accel import escapePDF, fp_str
+
+from .models import Certificado
+
+# Incrementar sempre que o layout do PDF mudar (invalida todo o cache)
+TEMPLATE_VERSAO = 2
+
+LOGO = Path(__file__).resolve().parent / "static" / "sgeaweb" / "img" / "logo-sgea.png"
+FONTES = ("Helvetica", "Helvetica-Oblique")
+
+
+def _desenhar_fundo(p):
+    """Parte estática do certificado: bordas, logo, título e rodapé."""
+    w, h = A4
+    p.setLineWidth(2)
+    p.rect(1 * cm, 1 * cm, w - 2 * cm, h - 2 * cm)
+    p.setLineWidth(0.5)
+    p.rect(1.3 * cm, 1.3 * cm, w - 2.6 * cm, h - 2.6 * cm)
+
+    if LOGO.exists():
+        p.drawImage(str(LOGO), w / 2 - 2 * cm, h - 3.3 * cm, width=4 * cm, height=1.5 * cm,
+                    mask="auto", preserveAspectRatio=True)
+
+    p.setFont("Helvetica-Bold", 20)
+    p.drawCentredString(w / 2, h - 4.5 * cm, "CERTIFICADO DE PARTICIPAÇÃO")
+
+    p.setFont("Helvetica-Oblique", 9)
+    p.drawCentredString(w / 2, 1.7 * cm, "SGEA — Sistema de Gestão de Eventos Acadêmicos")
+
+
+def _textos_variaveis(cert, aluno, evento):
+    """Parte variável: (fonte, tamanho, x, y, texto) de cada linha."""
+    w, h = A4
+    texto = (
+        f"Certificamos que {aluno} participou do evento '{evento.titulo}', "
+        f"realizado em {evento.data_inicio.strftime('%d/%m/%Y')}"
+    )
+    if evento.data_fim != evento.data_inicio:
+        texto += f" a {evento.data_fim.strftime('%d/%m/%Y')}"
+    texto += f", no local {evento.local}."
+
+    return [
+        ("Helvetica", 12, 2.5 * cm, h - 6.5 * cm, texto),
+        ("Helvetica", 11, 2.5 * cm, h - 8.5 * cm, f"Código de validação: {cert.codigo_validacao}"),
+        ("Helvetica-Oblique", 9, 2.5 * cm, 2.3 * cm, f"Emitido em {cert.emitido_em.strftime('%d/%m/%Y %H:%M')}"),
+    ]
+
+
+def renderizar_certificado_completo(cert, aluno, evento):
+    """Desenha o certificado inteiro num Canvas novo (caminho de referência e fallback)."""
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    _desenhar_fundo(p)
+    for fonte, tamanho, x, y, texto in _textos_variaveis(cert, aluno, evento):
+        p.setFont(fonte, tamanho)
+        p.drawString(x, y, texto)
+    p.showPage()
+    p.save()
+
+    pdf = buffer.getvalue()
+    buffer.close()
+    return pdf
+
+
+class ModeloCertificado:
+    """Documento-base gerado uma vez por TEMPLATE_VERSAO (e por processo).
+
+    O ReportLab desenha o fundo estático como form XObject e serializa o
+    documento uma única vez. Como o fluxo de conteúdo da página é o último
+    objeto do arquivo, tudo o que vem antes dele (fontes, imagem, fundo,
+    catálogo) e a tabela xref são constantes: por certificado só é preciso
+    escrever a sobreposição de texto e o offset final do xref.
+    """
+
+    def __init__(self):
+        buffer = BytesIO()
+        p = canvas.Canvas(buffer, pagesize=A4, invariant=1, pageCompression=0)
+        p.setTitle("Certificado de Participação")
+        p.setAuthor("SGEA")
+
+        p.beginForm("fundo")
+        _desenhar_fundo(p)
+        p.endForm()
+        p.doForm("fundo")
+
+        # Registra as fontes da sobreposição nos recursos da página
+        self.fontes = {}
+        for nome in FONTES:
+            p.setFont(nome, 10)
+            self.fontes[nome] = p._doc.getInternalFontName(nome).encode()
+        self.fundo = f"/{p._doc.getXObjectName('fundo')} Do".encode()
+
+        p.showPage()
+        p.save()
+        self._compilar(buffer.getvalue())
+
+    def _compilar(self, dados):
+        conteudo = int(re.search(rb"/Contents (\d+) 0 R", dados).group(1))
+        ultimo = list(re.finditer(rb"(\d+) 0 obj\n", dados))[-1]
+        if int(ultimo.group(1)) != conteudo:
+            raise RuntimeError("Layout inesperado do PDF-base gerado pelo ReportLab.")
+
+        self.numero_conteudo = conteudo
+        self.prefixo = dados[:ultimo.start()]
+        inicio_xref = dados.index(b"endobj\nxref\n", ultimo.start()) + len(b"endobj\n")
+        self.sufixo = dados[inicio_xref:dados.rindex(b"startxref")] + b"startxref\n"
+
+    def _operadores(self, fonte, tamanho, x, y, texto):
+        return b"BT %s %s Tf 1 0 0 1 %s %s Tm (%s) Tj ET\n" % (
+            self.fontes[fonte], fp_str(tamanho).encode(), fp_str(x).encode(), fp_str(y).encode(),
+            escapePDF(texto.encode("cp1252", errors="replace")).encode(),
+        )
+
+    def renderizar(self, cert, aluno, evento):
+        fluxo = b"".join(
+            [b"q\n", self.fundo, b"\nQ\n"]
+            + [self._operadores(*linha) for linha in _textos_variaveis(cert, aluno, evento)]
+        )
+        objeto = b"%d 0 obj\n<<\n/Length %d\n>>\nstream\n%s\nendstream\nendobj\n" % (
+            self.numero_conteudo, len(fluxo), fluxo
+        )
+        inicio_xref = len(self.prefixo) + len(objeto)
+        return b"".join([self.prefixo, objeto, self.sufixo, b"%d\n%%%%EOF\n" % inicio_xref])
+
+
+@functools.lru_cache(maxsize=1)
+def _modelo(versao):
+    try:
+        return ModeloCertificado()
+    except RuntimeError:
+        return None
+
+
+def renderizar_certificado(cert, aluno, evento):
+    """Bytes do PDF do certificado, usando o modelo pré-renderizado quando disponível."""
+    modelo = _modelo(TEMPLATE_VERSAO)
+    if modelo is None:
+        return renderizar_certificado_completo(cert, aluno, evento)
+    return modelo.renderizar(cert, aluno, evento)
+
+
+def nome_participante(user):
+    return user.get_full_name() or user.username
+
+
+def diretorio_cache():
+    return Path(settings.MEDIA_ROOT) / "certificados" / f"v{TEMPLATE_VERSAO}"
+
+
+def caminho_cache(codigo_validacao):
+    return diretorio_cache() / f"{codigo_validacao}.pdf"
+
+
+def _gravar_cache(caminho, pdf):
+    # Grava em arquivo temporário e renomeia: leitores nunca veem PDF pela metade
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp, caminho)
+
+
+def obter_pdf(cert):
+    """Devolve o caminho do PDF em cache, renderizando-o se necessário.
+
+    `cert` deve vir com `inscricao__participante` e `inscricao__evento`
+    carregados (select_related) para não gerar consultas extras.
+    """
+    caminho = caminho_cache(cert.codigo_validacao)
+    if caminho.exists():
+        return caminho
+
+    insc = cert.inscricao
+    pdf = renderizar_certificado(cert, nome_participante(insc.participante), insc.evento)
+
+    _gravar_cache(caminho, pdf)
+    return caminho
+
+
+def _dados_para_worker(cert):
+    """Extrai só o que o desenho precisa (valores simples, fáceis de enviar a outro processo)."""
+    insc = cert.inscricao
+    ev = insc.evento
+    return {
+        "codigo_validacao": cert.codigo_validacao,
+        "emitido_em": cert.emitido_em,
+        "aluno": nome_participante(insc.participante),
+        "titulo": ev.titulo,
+        "data_inicio": ev.data_inicio,
+        "data_fim": ev.data_fim,
+        "local": ev.local,
+    }
+
+
+def _renderizar_no_worker(dados):
+    # Executado nos processos do pool: não acessa o banco, só desenha e grava o cache
+    cert = SimpleNamespace(codigo_validacao=dados["codigo_validacao"], emitido_em=dados["emitido_em"])
+    evento = SimpleNamespace(titulo=dados["titulo"], data_inicio=dados["data_inicio"],
+                             data_fim=dados["data_fim"], local=dados["local"])
+    caminho = caminho_cache(cert.codigo_validacao)
+    _gravar_cache(caminho, renderizar_certificado(cert, dados["aluno"], evento))
+    return caminho
+
+
+def renderizar_em_lote(certs, processos=None, lote=200):
+    """Garante o PDF em cache de cada certificado, desenhando os ausentes num pool de processos.
+
+    Só para comandos de gerenciamento: criar processos dentro de um worker
+    web (que tem a thread da auditoria) não é seguro.
+
+    `certs` pode ser um iterador (ex.: queryset.iterator()); é consumido em
+    blocos de `lote` para manter a memória limitada. Gera pares
+    (certificado, caminho) na mesma ordem da entrada.
+    """
+    processos = processos or getattr(settings, "CERTIFICADOS_PDF_PROCESSOS", None) or os.cpu_count()
+    # django.setup como initializer: necessário quando o SO usa "spawn" (Windows/macOS)
+    with ProcessPoolExecutor(max_workers=processos, initializer=django.setup) as pool:
+        bloco = []
+        for cert in certs:
+            bloco.append(cert)
+            if len(bloco) >= lote:
+                yield from _renderizar_bloco(pool, bloco)
+                bloco = []
+        if bloco:
+            yield from _renderizar_bloco(pool, bloco)
+
+
+def _renderizar_bloco(pool, bloco):
+    ausentes = [c for c in bloco if not caminho_cache(c.codigo_validacao).exists()]
+    list(pool.map(_renderizar_no_worker, [_dados_para_worker(c) for c in ausentes]))
+    for cert in bloco:
+        yield cert, caminho_cache(cert.codigo_validacao)
+
+
+class _SaidaStreaming:
+    """Arquivo só-escrita que acumula bytes até serem retirados pelo gerador do ZIP."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        dados = b"".join(self._partes)
+        self._partes = []
+        return dados
+
+
+def zip_streaming(arquivos):
+    """Gera os bytes de um ZIP a partir de pares (nome_no_zip, caminho), um arquivo por vez.
+
+    A memória usada é a de um único PDF, independentemente do total de arquivos.
+    """
+    saida = _SaidaStreaming()
+    with zipfile.ZipFile(saida, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for nome, caminho in arquivos:
+            zf.write(caminho, arcname=nome)
+            yield saida.retirar()
+    yield saida.retirar()
+
+
+def zip_certificados_do_evento(evento_id, pool=False, processos=None):
+    """ZIP (em streaming) com o PDF de todos os certificados de um evento.
+
+    Na view (`pool=False`) nenhum processo é criado: os PDFs já estão no cache
+    (pré-gerados por `emitir_certificados`/`aquecer_cache_pdf`) e os poucos
+    ausentes são desenhados no próprio processo, que é rápido com o modelo
+    pré-renderizado. O pool de processos fica para os comandos.
+    """
+    certs = (Certificado.objects
+             .filter(inscricao__evento_id=evento_id)
+             .select_related("inscricao__participante", "inscricao__evento")
+             .order_by("id")
+             .iterator(chunk_size=500))
+    if pool:
+        pares = renderizar_em_lote(certs, processos=processos)
+    else:
+        pares = ((cert, obter_pdf(cert)) for cert in certs)
+    arquivos = (
+        (f"{cert.inscricao.participante.username}_{cert.codigo_validacao}.pdf", caminho)
+        for cert, caminho in pares
+    )
+    return zip_streaming(arquivos)
+
+
+def invalidar(codigos):
+    """Remove do cache os PDFs dos códigos informados."""
+    for codigo in codigos:
+        try:
+            caminho_cache(codigo).unlink()
+        except FileNotFoundError:
+            pass
+
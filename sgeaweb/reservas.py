@@ -0,0 +1,88 @@
+"""Motor de reservas de vagas (Item 6 — limite de vagas sem overbooking).
+
+Usado tanto pela view HTML (`views.inscrever`) quanto pela API
+(`InscricaoCreateSerializer`). A vaga é tomada com um UPDATE condicional
+sobre `Evento.vagas_ocupadas`, então o custo de uma inscrição não depende
+de quantos inscritos o evento já tem.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Evento, Inscricao
+
+
+class InscricaoRecusada(Exception):
+    """Inscrição barrada por regra de negócio (mensagem pronta para o usuário)."""
+
+    def __init__(self, mensagem, codigo):
+        super().__init__(mensagem)
+        self.mensagem = mensagem
+        self.codigo = codigo
+
+
+ENCERRADO = "encerrado"
+ORGANIZADOR = "organizador"
+DUPLICADA = "duplicada"
+ESGOTADO = "esgotado"
+
+
+def validar_inscricao(evento, usuario):
+    """Checagens baratas feitas antes de tentar reservar (não garantem a vaga)."""
+    if evento.data_fim < timezone.now().date():
+        raise InscricaoRecusada("Este evento já foi encerrado.", ENCERRADO)
+
+    if usuario == evento.organizador:
+        raise InscricaoRecusada("Organizadores não podem se inscrever no próprio evento.", ORGANIZADOR)
+
+    if Inscricao.objects.filter(evento=evento, participante=usuario).exists():
+        raise InscricaoRecusada("Você já está inscrito neste evento.", DUPLICADA)
+
+    if evento.lotado:
+        raise InscricaoRecusada("Não há vagas disponíveis.", ESGOTADO)
+
+
+def reservar_vaga(evento, usuario):
+    """Inscreve `usuario` em `evento` de forma atômica.
+
+    O UPDATE só incrementa o contador se ainda houver vaga; se nenhuma linha
+    for afetada, o evento está lotado. `atualizado_em` não muda: o evento em
+    si não mudou e não deve reaparecer no feed de mudanças (o ETag da API
+    acompanha as inscrições à parte). A criação da inscrição acontece na
+    mesma transação, então uma duplicidade desfaz a reserva.
+    """
+    validar_inscricao(evento, usuario)
+
+    try:
+        with transaction.atomic():
+            tomadas = (Evento.objects
+                       .filter(pk=evento.pk, vagas_ocupadas__lt=F("vagas"))
+                       .update(vagas_ocupadas=F("vagas_ocupadas") + 1))
+            if not tomadas:
+                raise InscricaoRecusada("Não há vagas disponíveis.", ESGOTADO)
+
+            insc = Inscricao(participante=usuario, evento=evento)
+            insc.vaga_reservada = True  # o signal de criação não conta a vaga de novo
+            insc.save()
+    except IntegrityError:
+        raise InscricaoRecusada("Você já está inscrito neste evento.", DUPLICADA)
+
+    return insc
+
+
+def ocupar_vaga(evento_id):
+    """Conta a vaga de uma inscrição criada fora de `reservar_vaga` (admin, ORM).
+
+    Sem checar o limite: quem cria pelo admin pode exceder as vagas de propósito,
+    e o contador precisa refletir as inscrições existentes.
+    """
+    (Evento.objects
+     .filter(pk=evento_id)
+     .update(vagas_ocupadas=F("vagas_ocupadas") + 1))
+
+
+def liberar_vaga(evento_id):
+    """Devolve uma vaga ao evento (inscrição removida)."""
+    (Evento.objects
+     .filter(pk=evento_id, vagas_ocupadas__gt=0)
+     .update(vagas_ocupadas=F("vagas_ocupadas") - 1))
@@ -0,0 +1,157 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from .models import TipoEvento, Evento, EventoRemovido, Inscricao, Certificado, PerfilUsuario, AcaoAuditoria
+from .api.authentication import esquecer_token, esquecer_usuario
+from . import cache_paginas, pdf, verificacao
+from .eventos import marcar_alterados
+from .reservas import ocupar_vaga, liberar_vaga
+from .certificados import inscricoes_pendentes, emitir_pendentes
+
+
+@receiver(post_save, sender=Inscricao)
+def contar_vaga(sender, instance, created, **kwargs):
+    # Inscrições criadas pelo admin/ORM também ocupam vaga; reservar_vaga já contou a sua
+    if created and not getattr(instance, "vaga_reservada", False):
+        ocupar_vaga(instance.evento_id)
+
+
+@receiver(post_delete, sender=Inscricao)
+def devolver_vaga(sender, instance, **kwargs):
+    # Mantém Evento.vagas_ocupadas coerente quando uma inscrição é removida
+    liberar_vaga(instance.evento_id)
+
+
+# Item 8 — emissão automática dirigida por eventos (fora do GET de "Minhas inscrições").
+# Eventos que terminam pela simples passagem do tempo são cobertos pelo
+# comando `emitir_certificados`, agendado diariamente.
+@receiver(post_save, sender=Inscricao)
+def emitir_ao_confirmar_presenca(sender, instance, **kwargs):
+    if not instance.presenca_confirmada or instance.evento.data_fim > timezone.now().date():
+        return
+    qs = inscricoes_pendentes().filter(pk=instance.pk)
+    transaction.on_commit(lambda: emitir_pendentes(qs, acao=AcaoAuditoria.CERTIFICADO_GERADO_AUTO))
+
+
+@receiver(post_save, sender=Evento)
+def emitir_ao_encerrar_evento(sender, instance, **kwargs):
+    if instance.data_fim > timezone.now().date():
+        return
+    qs = inscricoes_pendentes(evento_id=instance.pk)
+    transaction.on_commit(lambda: emitir_pendentes(qs, acao=AcaoAuditoria.CERTIFICADO_GERADO_AUTO))
+
+
+# Caches derivados do certificado (PDF e verificação pública):
+# nome do participante ou dados do evento alterados -> conteúdo obsoleto
+def _invalidar_certificados(**filtro):
+    codigos = list(Certificado.objects.filter(**filtro).values_list("codigo_validacao", flat=True))
+    pdf.invalidar(codigos)
+    verificacao.esquecer(codigos)
+
+
+@receiver(post_save, sender=User)
+def invalidar_certificados_do_participante(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    transaction.on_commit(lambda: _invalidar_certificados(inscricao__participante_id=instance.pk))
+
+
+@receiver(post_save, sender=Evento)
+def invalidar_certificados_do_evento(sender, instance, created, **kwargs):
+    if created:
+        return
+    transaction.on_commit(lambda: _invalidar_certificados(inscricao__evento_id=instance.pk))
+
+
+@receiver(post_save, sender=Certificado)
+def registrar_codigo(sender, instance, created, **kwargs):
+    if created:
+        verificacao.registrar([instance.codigo_validacao])
+
+
+@receiver(post_delete, sender=Certificado)
+def remover_certificado_dos_caches(sender, instance, **kwargs):
+    pdf.invalidar([instance.codigo_validacao])
+    verificacao.esquecer([instance.codigo_validacao])
+
+
+@receiver(post_delete, sender=Evento)
+def registrar_lapide(sender, instance, **kwargs):
+    # Feed de mudanças da API: clientes sincronizados precisam saber o que sumiu
+    EventoRemovido.objects.create(evento_id=instance.pk)
+
+
+# Cache de páginas (home e detalhe): só incrementa as versões das dependências
+@receiver([post_save, post_delete], sender=Evento)
+def invalidar_paginas_do_evento(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache_paginas.invalidar("vitrine", f"evento:{instance.pk}"))
+
+
+@receiver([post_save, post_delete], sender=Inscricao)
+def invalidar_vagas_na_vitrine(sender, instance, **kwargs):
+    # Vagas restantes aparecem nos cards da home
+    transaction.on_commit(lambda: cache_paginas.invalidar("vitrine", f"evento:{instance.evento_id}"))
+
+
+@receiver([post_save, post_delete], sender=TipoEvento)
+def invalidar_paginas_do_tipo(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache_paginas.invalidar("vitrine", "cadastros"))
+
+
+# Feed de mudanças da API: nome do tipo, username do organizador e nome do
+# responsável saem junto com o evento; mudar um deles altera o evento exibido
+CAMPOS_EXIBIDOS = {TipoEvento: ("nome",), User: ("username", "first_name", "last_name")}
+
+
+@receiver(pre_save, sender=TipoEvento)
+@receiver(pre_save, sender=User)
+def lembrar_campos_exibidos(sender, instance, update_fields=None, **kwargs):
+    campos = CAMPOS_EXIBIDOS[sender]
+    if instance.pk is None or (update_fields is not None and not set(update_fields) & set(campos)):
+        return
+    instance._exibido_antes = sender.objects.filter(pk=instance.pk).values_list(*campos).first()
+
+
+@receiver(post_save, sender=TipoEvento)
+@receiver(post_save, sender=User)
+def marcar_eventos_exibidos(sender, instance, created, **kwargs):
+    antes = instance.__dict__.pop("_exibido_antes", None)
+    if created or antes is None or antes == tuple(getattr(instance, c) for c in CAMPOS_EXIBIDOS[sender]):
+        return
+    if sender is TipoEvento:
+        marcar_alterados(Q(TIPO=instance))
+    else:
+        marcar_alterados(Q(organizador=instance) | Q(responsavel=instance))
+
+
+@receiver(post_save, sender=User)
+def invalidar_paginas_do_responsavel(sender, instance, created, update_fields=None, **kwargs):
+    # Nome do professor responsável aparece no detalhe do evento
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    transaction.on_commit(lambda: cache_paginas.invalidar("cadastros"))
+
+
+# Cache da autenticação por token da API
+@receiver(post_delete, sender=Token)
+def esquecer_token_removido(sender, instance, **kwargs):
+    esquecer_token(instance.key)
+
+
+@receiver([post_save, post_delete], sender=PerfilUsuario)
+def esquecer_token_do_perfil(sender, instance, **kwargs):
+    transaction.on_commit(lambda: esquecer_usuario(instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+def esquecer_token_do_usuario(sender, instance, created=False, update_fields=None, **kwargs):
+    # Ex.: is_active desligado; last_login sozinho não muda nada para a API
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    transaction.on_commit(lambda: esquecer_usuario(instance.pk))
@@ -0,0 +1,26 @@
+"""Fábricas mínimas de dados para os testes."""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from sgeaweb.models import Evento, PerfilUsuario, TipoEvento
+
+
+def usuario(username, perfil="ALUNO", confirmado=True, **extra):
+    user = User.objects.create_user(username, email=f"{username}@exemplo.com", password="Senha@1234", **extra)
+    PerfilUsuario.objects.create(user=user, perfil=perfil, instituicao="UF", email_confirmado=confirmado)
+    return user
+
+
+def tipo(nome="Palestra"):
+    return TipoEvento.objects.create(nome=nome)
+
+
+def evento(organizador, responsavel, tipo_evento=None, dias=10, duracao=1, **extra):
+    inicio = timezone.localdate() + timedelta(days=dias)
+    dados = {"titulo": "Evento de teste", "horario": "19:00", "local": "Auditório", "vagas": 10,
+             "data_inicio": inicio, "data_fim": inicio + timedelta(days=duracao)}
+    dados.update(extra)
+    return Evento.objects.create(TIPO=tipo_evento or tipo(), organizador=organizador, responsavel=responsavel,
+                                 **dados)
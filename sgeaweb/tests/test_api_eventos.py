@@ -0,0 +1,59 @@
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from sgeaweb.models import Evento
+
+from . import dados
+
+
+class ListagemDeEventosTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.aluno = dados.usuario("aluno")
+        org = dados.usuario("org", "ORGANIZADOR")
+        prof = dados.usuario("prof", "PROFESSOR")
+        tipo = dados.tipo()
+        inicio = timezone.localdate() + timedelta(days=3)
+        Evento.objects.bulk_create(
+            Evento(TIPO=tipo, organizador=org, responsavel=prof, titulo=f"Oficina rvdjango {i}",
+                   descricao="rvdjango" * (i % 3), data_inicio=inicio, data_fim=inicio,
+                   horario="19:00", local="Sala", vagas=10) for i in range(7)
+        )
+
+    def setUp(self):
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        throttle = override_settings(API_THROTTLE_DB=Path(pasta.name) / "throttle.sqlite3")
+        throttle.enable()
+        self.addCleanup(throttle.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.aluno)
+
+    def test_busca_paginada_com_o_envelope_do_cursor(self):
+        ids, url = [], "/api/eventos/?q=rvdjango&page_size=3&fields=id"
+        paginas = 0
+        while url:
+            corpo = self.client.get(url).json()
+            self.assertEqual(set(corpo), {"next", "previous", "results"})
+            self.assertLessEqual(len(corpo["results"]), 3)
+            ids += [item["id"] for item in corpo["results"]]
+            url, paginas = corpo["next"], paginas + 1
+        self.assertEqual(paginas, 3)
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(len(set(ids)), 7)
+
+    def test_busca_em_uma_pagina_tem_next_nulo(self):
+        corpo = self.client.get("/api/eventos/?q=rvdjango&fields=id").json()
+        self.assertEqual(len(corpo["results"]), 7)
+        self.assertIsNone(corpo["next"])
+        self.assertIsNone(corpo["previous"])
+
+    def test_sem_busca_continua_por_cursor(self):
+        corpo = self.client.get("/api/eventos/?page_size=5&fields=id").json()
+        self.assertEqual(len(corpo["results"]), 5)
+        self.assertIn("cursor=", corpo["next"])
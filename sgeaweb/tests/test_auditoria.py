@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+from datetime import datetime, time, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from sgeaweb import auditoria, cursores
+from sgeaweb.models import Auditoria, AcaoAuditoria
+
+from . import dados
+
+
+class AuditoriaArquivadaTests(TestCase):
+    def setUp(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        configuracao = override_settings(AUDITORIA_ARQUIVO_DIR=pasta)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        cache.clear()
+
+        self.org = dados.usuario("org", "ORGANIZADOR")
+        self.dia = timezone.localdate() - timedelta(days=400)
+        meio_dia = timezone.make_aware(datetime.combine(self.dia, time(12)))
+        Auditoria.objects.bulk_create([
+            Auditoria(usuario=self.org, acao=AcaoAuditoria.LOGIN, descricao=f"login {i}",
+                      data_hora=meio_dia + timedelta(minutes=i))
+            for i in range(5)
+        ])
+        # Outro dia do mesmo mês, no mesmo arquivo
+        self.outro_dia = self.dia.replace(day=1 if self.dia.day != 1 else 2)
+        Auditoria.objects.create(usuario=self.org, acao=AcaoAuditoria.LOGIN, descricao="outro dia",
+                                 data_hora=timezone.make_aware(datetime.combine(self.outro_dia, time(12))))
+        auditoria.arquivar(timezone.now() - timedelta(days=180))
+
+    def test_cursor_invalido_mostra_o_dia_arquivado(self):
+        self.client.force_login(self.org)
+        resp = self.client.get("/auditoria/", {"dia": self.dia.isoformat(), "cursor": "lixo"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context["registros"]), 5)
+
+    def test_links_mantem_os_filtros(self):
+        proxima, primeira = cursores.links(QueryDict("dia=2024-01-01&usuario=org&cursor=a"), "b", "a")
+        self.assertEqual(proxima, "?dia=2024-01-01&usuario=org&cursor=b")
+        self.assertEqual(primeira, "?dia=2024-01-01&usuario=org")
+
+    def test_so_o_dia_pedido_e_lido_e_guardado(self):
+        with mock.patch("sgeaweb.auditoria._linhas_do_dia", wraps=auditoria._linhas_do_dia) as leitura:
+            primeira, proximo = auditoria.pagina_do_dia(self.dia, tamanho=3)
+            segunda, _ = auditoria.pagina_do_dia(self.dia, cursor=proximo, tamanho=3)
+            self.assertEqual(len(auditoria.ler_arquivados(self.dia, usuario="org")), 5)
+            self.assertEqual(leitura.call_count, 1)
+            # O outro dia do mês não foi para o cache junto: é lido quando pedido
+            self.assertEqual([r.descricao for r in auditoria.ler_arquivados(self.outro_dia)], ["outro dia"])
+            self.assertEqual(leitura.call_count, 2)
+        self.assertEqual([r.descricao for r in primeira + segunda], [f"login {i}" for i in range(4, -1, -1)])
+
+
+class LogActionSincronoTests(TestCase):
+    @override_settings(AUDITORIA_ASSINCRONA=False, AUDITORIA_ACOES_AGREGADAS=("API_CONSULTA_EVENTOS",))
+    def test_acao_agregada_grava_na_hora_sem_assincrono(self):
+        user = dados.usuario("cliente")
+        auditoria.log_action(user, AcaoAuditoria.API_CONSULTA_EVENTOS, "Listagem via API.")
+        self.assertTrue(Auditoria.objects.filter(usuario=user, acao=AcaoAuditoria.API_CONSULTA_EVENTOS).exists())
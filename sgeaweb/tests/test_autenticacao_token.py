@@ -0,0 +1,62 @@
+import tempfile
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from sgeaweb import cache_compartilhado
+from sgeaweb.api.authentication import CachedTokenAuthentication, _chave
+
+from . import dados
+
+
+class CacheDoTokenTests(TestCase):
+    """O cache do token é compartilhado: o que um worker invalida some para os outros."""
+
+    def setUp(self):
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        arquivos = override_settings(CACHES={
+            **settings.CACHES, cache_compartilhado.ALIAS: {**settings.CACHES[cache_compartilhado.ALIAS],
+                                                          "LOCATION": pasta.name},
+        })
+        arquivos.enable()
+        self.addCleanup(arquivos.disable)
+        self.aluno = dados.usuario("aluno")
+        self.token = Token.objects.create(user=self.aluno)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        # Outra instância do backend, como a de outro processo
+        self.outro_worker = caches.create_connection(cache_compartilhado.ALIAS)
+
+    def autenticar(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get("/api/eventos/changes/").status_code
+
+    def test_entrada_vista_por_outro_worker(self):
+        self.assertEqual(self.autenticar(), 200)
+        user, token = self.outro_worker.get(_chave(self.token.key))
+        self.assertEqual((user.pk, token.key), (self.aluno.pk, self.token.key))
+
+    def test_desativar_usuario_vale_para_todos_os_workers(self):
+        self.assertEqual(self.autenticar(), 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.aluno.is_active = False
+            self.aluno.save()
+        self.assertIsNone(self.outro_worker.get(_chave(self.token.key)))
+        self.assertEqual(self.autenticar(), 401)
+
+    def test_token_excluido_vale_para_todos_os_workers(self):
+        self.assertEqual(self.autenticar(), 200)
+        chave = _chave(self.token.key)
+        self.token.delete()
+        self.assertIsNone(self.outro_worker.get(chave))
+        self.assertEqual(self.autenticar(), 401)
+
+    def test_acerto_nao_consulta_o_banco(self):
+        self.assertEqual(self.autenticar(), 200)
+        with self.assertNumQueries(0):
+            user, token = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+        self.assertEqual(user.pk, self.aluno.pk)
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from sgeaweb.busca import buscar
+from sgeaweb.eventos import vitrine
+from sgeaweb.models import Evento
+
+from . import dados
+
+
+class BuscaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        org = dados.usuario("org", "ORGANIZADOR")
+        prof = dados.usuario("prof", "PROFESSOR")
+        tipo = dados.tipo()
+        hoje = timezone.localdate()
+        # Muitos eventos passados mais relevantes (termo no título) que os futuros
+        Evento.objects.bulk_create(
+            [Evento(TIPO=tipo, organizador=org, responsavel=prof, titulo=f"rvpython rvpython {i}",
+                    data_inicio=hoje - timedelta(days=30), data_fim=hoje - timedelta(days=29),
+                    horario="19:00", local="Sala", vagas=10) for i in range(280)]
+            + [Evento(TIPO=tipo, organizador=org, responsavel=prof, titulo=f"Encontro {i}",
+                      descricao="rvpython", data_inicio=hoje + timedelta(days=5),
+                      data_fim=hoje + timedelta(days=6), horario="19:00", local="Sala", vagas=10)
+               for i in range(20)]
+        )
+
+    def test_filtros_valem_antes_do_corte(self):
+        self.assertEqual(buscar(vitrine(), "rvpython").count(), 20)
+        self.assertEqual(len(buscar(vitrine(), "rvpython")[:48]), 20)
+
+    def test_sem_limite_fixo_e_por_relevancia(self):
+        todos = list(buscar(Evento.objects.all(), "rvpy"))
+        self.assertEqual(len(todos), 300)
+        self.assertTrue(todos[0].titulo.startswith("rvpython"))
+        self.assertTrue(todos[-1].titulo.startswith("Encontro"))
+
+    def test_texto_sem_termos(self):
+        self.assertEqual(buscar(Evento.objects.all(), " !! ").count(), 0)
@@ -0,0 +1,39 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from . import dados
+
+
+class CacheAnonimoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        org = dados.usuario("org", "ORGANIZADOR")
+        prof = dados.usuario("prof", "PROFESSOR")
+        dados.evento(org, prof, titulo="Encontro futuro")
+
+    def setUp(self):
+        cache.clear()
+
+    def x_cache(self, url):
+        return self.client.get(url)["X-Cache"]
+
+    def test_parametros_ignorados_nao_criam_entradas(self):
+        self.assertEqual(self.x_cache("/?utm=1"), "MISS")
+        self.assertEqual(self.x_cache("/?utm=2&fbclid=abc"), "HIT")
+        self.assertEqual(self.x_cache("/"), "HIT")
+
+    def test_parametros_lidos_pela_view_variam_a_pagina(self):
+        self.assertEqual(self.x_cache("/"), "MISS")
+        self.assertEqual(self.x_cache("/?todos=1"), "MISS")
+        self.assertEqual(self.x_cache("/?q=encontro"), "MISS")
+        self.assertEqual(self.x_cache("/?q=encontro&x=1"), "HIT")
+
+    def test_virada_do_dia_gera_outra_pagina(self):
+        self.assertEqual(self.x_cache("/"), "MISS")
+        amanha = timezone.localdate() + timedelta(days=1)
+        with mock.patch("sgeaweb.cache_paginas.timezone.localdate", return_value=amanha):
+            self.assertEqual(self.x_cache("/"), "MISS")
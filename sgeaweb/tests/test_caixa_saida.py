@@ -0,0 +1,71 @@
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from sgeaweb.caixa_saida import enviar_lote
+from sgeaweb.models import EmailSaida, StatusEmail
+
+FALHA_SMTP = mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages",
+                        side_effect=SMTPException("servidor recusou"))
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                   EMAIL_SAIDA_TENTATIVAS=2, EMAIL_SAIDA_ESPERA=30)
+class CaixaDeSaidaTests(TestCase):
+    def setUp(self):
+        resposta = self.client.post(reverse("cadastro"), {
+            "username": "novo", "first_name": "Nova", "last_name": "Pessoa", "email": "novo@exemplo.com",
+            "password": "Senha@1234", "password2": "Senha@1234",
+            "telefone": "(61) 99999-9999", "instituicao": "UF", "perfil": "ALUNO",
+        })
+        self.assertRedirects(resposta, reverse("login"), fetch_redirect_response=False)
+        self.email = EmailSaida.objects.get()
+
+    def liberar_nova_tentativa(self):
+        EmailSaida.objects.update(proxima_tentativa=timezone.now() - timedelta(seconds=1))
+
+    def test_cadastro_so_enfileira(self):
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(self.email.status, StatusEmail.PENDENTE)
+        self.assertEqual(self.email.destinatarios, ["novo@exemplo.com"])
+
+    def test_envio(self):
+        self.assertEqual(enviar_lote(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["novo@exemplo.com"])
+        self.assertIn("/confirmar/", mail.outbox[0].alternatives[0][0])
+        self.email.refresh_from_db()
+        self.assertEqual((self.email.status, self.email.tentativas), (StatusEmail.ENVIADO, 1))
+        self.assertEqual(enviar_lote(), (0, 0))
+
+    def test_falha_reagenda_com_espera_e_depois_envia(self):
+        antes = timezone.now()
+        with FALHA_SMTP:
+            self.assertEqual(enviar_lote(), (0, 1))
+        self.email.refresh_from_db()
+        self.assertEqual((self.email.status, self.email.tentativas), (StatusEmail.PENDENTE, 1))
+        self.assertIn("servidor recusou", self.email.erro)
+        espera = (self.email.proxima_tentativa - antes).total_seconds()
+        self.assertTrue(30 <= espera <= 30 * 1.25 + 5, espera)
+
+        self.assertEqual(enviar_lote(), (0, 0))  # ainda esperando
+        self.liberar_nova_tentativa()
+        self.assertEqual(enviar_lote(), (1, 0))
+        self.email.refresh_from_db()
+        self.assertEqual((self.email.status, self.email.tentativas, self.email.erro), (StatusEmail.ENVIADO, 2, ""))
+
+    def test_esgota_as_tentativas(self):
+        with FALHA_SMTP:
+            enviar_lote()
+            self.liberar_nova_tentativa()
+            self.assertEqual(enviar_lote(), (0, 1))
+        self.email.refresh_from_db()
+        self.assertEqual((self.email.status, self.email.tentativas), (StatusEmail.FALHOU, 2))
+        self.liberar_nova_tentativa()
+        self.assertEqual(enviar_lote(), (0, 0))
+        self.assertEqual(mail.outbox, [])
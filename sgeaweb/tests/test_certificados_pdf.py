@@ -0,0 +1,37 @@
+import io
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from sgeaweb.models import Certificado, Inscricao
+from sgeaweb.pdf import caminho_cache
+
+from . import dados
+
+
+class ZipCertificadosTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        self.org = dados.usuario("org", "ORGANIZADOR")
+        self.evento = dados.evento(self.org, dados.usuario("prof", "PROFESSOR"), dias=-5)
+        self.certs = []
+        for i in range(3):
+            insc = Inscricao.objects.create(participante=dados.usuario(f"aluno{i}"), evento=self.evento)
+            self.certs.append(Certificado.objects.create(inscricao=insc, codigo_validacao=f"COD{i}"))
+
+    def test_view_nao_cria_processos(self):
+        self.client.force_login(self.org)
+        with override_settings(MEDIA_ROOT=self.media), \
+                mock.patch("sgeaweb.pdf.ProcessPoolExecutor", side_effect=AssertionError("pool na view")):
+            resp = self.client.get(f"/eventos/{self.evento.id}/inscricoes/certificados.zip")
+            corpo = b"".join(resp.streaming_content)
+            self.assertTrue(all(caminho_cache(c.codigo_validacao).exists() for c in self.certs))
+
+        self.assertEqual(resp.status_code, 200)
+        with zipfile.ZipFile(io.BytesIO(corpo)) as zf:
+            self.assertEqual(len(zf.namelist()), 3)
+            self.assertTrue(zf.read(zf.namelist()[0]).startswith(b"%PDF"))
@@ -0,0 +1,69 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from sgeaweb.eventos import carimbo_colecao, mudancas
+from sgeaweb.models import Inscricao
+from sgeaweb.reservas import reservar_vaga
+
+from . import dados
+
+
+class FeedDeMudancasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = dados.usuario("org", "ORGANIZADOR")
+        cls.prof = dados.usuario("prof", "PROFESSOR")
+        cls.outro = dados.usuario("outro", "PROFESSOR")
+        cls.aluno = dados.usuario("aluno")
+        cls.tipo = dados.tipo("Palestra")
+        cls.evento = dados.evento(cls.org, cls.prof, cls.tipo)
+        cls.alheio = dados.evento(cls.org, cls.outro, dados.tipo("Oficina"))
+
+    def sincronizar(self):
+        # Tudo que já existe fica antes da margem do feed
+        depois = timezone.now() + timedelta(hours=1)
+        with mock.patch("sgeaweb.eventos.timezone.now", return_value=depois):
+            eventos, _, cursor, _ = mudancas()
+        self.assertEqual(len(eventos), 2)
+        return cursor
+
+    def mudados(self, cursor):
+        depois = timezone.now() + timedelta(hours=2)
+        with mock.patch("sgeaweb.eventos.timezone.now", return_value=depois):
+            return [e.id for e in mudancas(cursor)[0]]
+
+    def test_reserva_nao_entra_no_feed_mas_muda_o_carimbo(self):
+        cursor, carimbo = self.sincronizar(), carimbo_colecao()
+        reservar_vaga(self.evento, self.aluno)
+        self.assertNotEqual(carimbo_colecao(), carimbo)
+        carimbo = carimbo_colecao()
+        Inscricao.objects.filter(participante=self.aluno).delete()
+        self.assertNotEqual(carimbo_colecao(), carimbo)
+        self.assertEqual(self.mudados(cursor), [])
+
+    def test_renomear_tipo_entra_no_feed(self):
+        cursor = self.sincronizar()
+        self.tipo.descricao = "só a descrição"
+        self.tipo.save()
+        self.assertEqual(self.mudados(cursor), [])
+        self.tipo.nome = "Palestra magna"
+        self.tipo.save()
+        self.assertEqual(self.mudados(cursor), [self.evento.id])
+
+    def test_nome_do_responsavel_entra_no_feed(self):
+        cursor = self.sincronizar()
+        self.prof.set_password("Outra@1234")
+        self.prof.save()
+        self.assertEqual(self.mudados(cursor), [])
+        self.prof.first_name = "Ada"
+        self.prof.save(update_fields=["first_name"])
+        self.assertEqual(self.mudados(cursor), [self.evento.id])
+
+    def test_username_do_organizador_entra_no_feed(self):
+        cursor = self.sincronizar()
+        self.org.username = "organizacao"
+        self.org.save()
+        self.assertEqual(sorted(self.mudados(cursor)), sorted([self.evento.id, self.alheio.id]))
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from sgeaweb.api.views import EventoListAPI
+from sgeaweb.eventos import filtrar, vitrine
+from sgeaweb.management.commands.explicar_filtros_eventos import EXEMPLOS, planos, sem_ordenacao, usa_indice
+
+from . import dados
+
+
+class PlanoDosFiltrosTests(TestCase):
+    def test_toda_combinacao_de_filtros_e_busca_em_indice(self):
+        total = 0
+        for nomes, plano in planos(EventoListAPI.queryset):
+            total += 1
+            with self.subTest(filtros=nomes):
+                self.assertNotIn("TEMP B-TREE", plano)
+                if not nomes:
+                    # Sem filtro a listagem é a tabela inteira; basta vir na ordem do índice
+                    self.assertTrue(sem_ordenacao(plano))
+                    continue
+                leituras = [linha for linha in plano.splitlines() if " evento " in f"{linha} "]
+                self.assertTrue(leituras)
+                self.assertFalse([linha for linha in leituras if "SCAN" in linha], plano)
+                self.assertTrue(usa_indice(plano))
+        self.assertEqual(total, 2 ** len(EXEMPLOS))
+
+    def test_vitrine_e_sem_filtros_nao_ordenam_em_memoria(self):
+        plano = vitrine().explain()
+        self.assertNotIn("SCAN", plano)
+        self.assertNotIn("TEMP B-TREE", plano)
+        self.assertTrue(sem_ordenacao(EventoListAPI.queryset.all().explain()))
+
+    def test_scan_na_ordem_do_indice_nao_conta(self):
+        self.assertFalse(usa_indice("3 0 0 SCAN evento USING INDEX evento_inicio_id_idx"))
+        self.assertFalse(usa_indice("3 0 0 SEARCH evento USING INDEX evento_tipo_inicio_idx (TIPO_id=?)\n"
+                                    "9 0 0 USE TEMP B-TREE FOR ORDER BY"))
+
+
+class ResultadoDosFiltrosTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        org = dados.usuario("org", "ORGANIZADOR")
+        prof = dados.usuario("prof", "PROFESSOR")
+        cls.longo = dados.evento(org, prof, dias=-20, duracao=30, local="Auditório 1")
+        cls.passado = dados.evento(org, prof, dias=-10, duracao=1, local="Sala 2")
+        cls.lotado = dados.evento(org, prof, dias=5, local="auditório 1", vagas=1, vagas_ocupadas=1)
+
+    def ids(self, **filtros):
+        return list(filtrar(EventoListAPI.queryset.all(), **filtros).values_list("id", flat=True))
+
+    def test_desde_inclui_evento_longo_que_comecou_antes(self):
+        hoje = timezone.localdate()
+        self.assertEqual(self.ids(desde=hoje), [self.longo.id, self.lotado.id])
+        self.assertEqual(self.ids(desde=hoje + timedelta(days=30)), [])
+        self.assertEqual(list(vitrine().values_list("id", flat=True)), [self.longo.id, self.lotado.id])
+
+    def test_local_exato_sem_diferenciar_maiusculas(self):
+        self.assertEqual(self.ids(local="AUDITóRIO 1"), [self.longo.id, self.lotado.id])
+        self.assertEqual(self.ids(local="Auditório"), [])
+
+    def test_com_vagas(self):
+        self.assertEqual(self.ids(com_vagas=True, desde=date(2000, 1, 1)), [self.longo.id, self.passado.id])
@@ -0,0 +1,48 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.test import RequestFactory, TestCase
+
+from sgeaweb.papeis import SESSAO, _resolver
+
+from . import dados
+
+
+class PapelNaSessaoTests(TestCase):
+    def setUp(self):
+        self.org = dados.usuario("org", "ORGANIZADOR")
+        self.client.force_login(self.org)
+        self.sessoes = import_module(settings.SESSION_ENGINE).SessionStore
+
+    def resolver(self):
+        # Cada requisição lê a sessão do banco, como um worker qualquer
+        request = RequestFactory().get("/")
+        request.session = self.sessoes(self.client.session.session_key)
+        user = _resolver(request)
+        if request.session.modified:
+            request.session.save()
+        return user._papel, request.session.modified
+
+    def test_sessao_so_e_regravada_quando_o_perfil_muda(self):
+        papel, regravada = self.resolver()
+        self.assertTrue(papel.organizador)
+        self.assertTrue(regravada)
+        for _ in range(3):
+            self.assertEqual(self.resolver(), (papel, False))
+
+    def test_rebaixar_organizador_vale_na_requisicao_seguinte(self):
+        self.resolver()
+        perfil = self.org.perfil
+        perfil.perfil = "ALUNO"
+        perfil.save()
+        papel, regravada = self.resolver()
+        self.assertFalse(papel.organizador)
+        self.assertTrue(papel.participante)
+        self.assertTrue(regravada)
+        self.assertEqual(self.client.session[SESSAO][1], "ALUNO")
+
+    def test_perfil_excluido(self):
+        self.resolver()
+        self.org.perfil.delete()
+        papel, _ = self.resolver()
+        self.assertEqual(papel.perfil, "SEM_PERFIL")
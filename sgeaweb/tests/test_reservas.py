@@ -0,0 +1,54 @@
+from django.test import TestCase
+
+from sgeaweb.models import Evento, Inscricao
+from sgeaweb.reservas import ESGOTADO, InscricaoRecusada, reservar_vaga
+
+from . import dados
+
+
+class ContadorDeVagasTests(TestCase):
+    def setUp(self):
+        self.org = dados.usuario("org", "ORGANIZADOR")
+        self.prof = dados.usuario("prof", "PROFESSOR")
+        self.aluno = dados.usuario("aluno")
+        self.evento = dados.evento(self.org, self.prof, vagas=2)
+
+    def ocupadas(self):
+        return Evento.objects.values_list("vagas_ocupadas", flat=True).get(pk=self.evento.pk)
+
+    def test_reserva_conta_uma_vez(self):
+        reservar_vaga(self.evento, self.aluno)
+        self.assertEqual(self.ocupadas(), 1)
+
+    def test_inscricao_pelo_orm_tambem_conta(self):
+        insc = Inscricao.objects.create(participante=self.aluno, evento=self.evento)
+        self.assertEqual(self.ocupadas(), 1)
+        insc.delete()
+        self.assertEqual(self.ocupadas(), 0)
+
+    def test_exclusao_nao_deixa_contador_negativo(self):
+        insc = reservar_vaga(self.evento, self.aluno)
+        Evento.objects.filter(pk=self.evento.pk).update(vagas_ocupadas=0)
+        insc.delete()
+        self.assertEqual(self.ocupadas(), 0)
+
+    def test_edicao_com_instancia_antiga_nao_apaga_reserva(self):
+        antigo = Evento.objects.get(pk=self.evento.pk)  # ex.: formulário de edição aberto antes da reserva
+        reservar_vaga(Evento.objects.get(pk=self.evento.pk), self.aluno)
+        antigo.titulo = "Título novo"
+        antigo.save()
+        self.assertEqual(self.ocupadas(), 1)
+        self.assertEqual(Evento.objects.get(pk=self.evento.pk).titulo, "Título novo")
+
+    def test_limite_de_vagas(self):
+        antigo = Evento.objects.get(pk=self.evento.pk)
+        reservar_vaga(self.evento, self.aluno)
+        antigo.save()
+        reservar_vaga(self.evento, dados.usuario("aluno2"))
+        antigo.save()
+        # A instância antiga ainda acha que há vaga; o UPDATE condicional recusa mesmo assim
+        with self.assertRaises(InscricaoRecusada) as erro:
+            reservar_vaga(antigo, dados.usuario("aluno3"))
+        self.assertEqual(erro.exception.codigo, ESGOTADO)
+        self.assertEqual(self.ocupadas(), 2)
+        self.assertEqual(Inscricao.objects.filter(evento=self.evento).count(), 2)
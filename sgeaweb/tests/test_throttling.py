@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from sgeaweb.api.throttling import BaldeThrottle, consumir
+
+
+def _martelar(caminho, capacidade, tentativas, largada, fila):
+    # Processo separado: conexão própria ao SQLite compartilhado
+    largada.wait()  # todos começam juntos, depois de subir o interpretador
+    aceitas = 0
+    for _ in range(tentativas):
+        permitido, _espera = consumir("teste:balde", capacidade, capacidade / 86400, caminho=caminho)
+        aceitas += permitido
+    fila.put(aceitas)
+
+
+class BaldeTests(SimpleTestCase):
+    def setUp(self):
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        self.caminho = os.path.join(pasta.name, "throttle.sqlite3")
+
+    def consumir(self, agora, capacidade=3, por_segundo=0.5):
+        return consumir("teste", capacidade, por_segundo, agora=agora, caminho=self.caminho)
+
+    def test_esvazia_e_informa_a_espera(self):
+        self.assertEqual([self.consumir(1000.0) for _ in range(3)], [(True, 0.0)] * 3)
+        self.assertEqual(self.consumir(1000.0), (False, 2.0))  # 1 ficha a 0,5/s
+        self.assertEqual(self.consumir(1001.0), (False, 1.0))  # meia ficha reposta
+
+    def test_repoe_com_o_tempo_ate_a_capacidade(self):
+        for _ in range(3):
+            self.consumir(1000.0)
+        self.assertEqual(self.consumir(1002.0), (True, 0.0))
+        self.assertFalse(self.consumir(1002.0)[0])
+        # Muito tempo parado não acumula além da capacidade
+        aceitas = [self.consumir(9000.0)[0] for _ in range(4)]
+        self.assertEqual(aceitas, [True, True, True, False])
+
+    def test_wait_do_throttle(self):
+        throttle = type("DuasPorMinuto", (BaldeThrottle,), {"rate": "2/min"})()
+        with mock.patch.object(throttle, "get_cache_key", return_value="usuario:1"), \
+                mock.patch("sgeaweb.api.throttling.time.time", return_value=5000.0), \
+                mock.patch("sgeaweb.api.throttling._caminho", return_value=self.caminho):
+            self.assertTrue(throttle.allow_request(None, None))
+            self.assertEqual(throttle.wait(), 0.0)
+            self.assertTrue(throttle.allow_request(None, None))
+            self.assertFalse(throttle.allow_request(None, None))
+            self.assertAlmostEqual(throttle.wait(), 30.0)
+
+    def test_limite_global_entre_processos(self):
+        processos, capacidade, tentativas = 4, 50, 40
+        contexto = multiprocessing.get_context("spawn")
+        largada, fila = contexto.Barrier(processos + 1), contexto.Queue()
+        filhos = [contexto.Process(target=_martelar, args=(self.caminho, capacidade, tentativas, largada, fila))
+                  for _ in range(processos)]
+        for filho in filhos:
+            filho.start()
+        largada.wait(timeout=60)
+        aceitas = [fila.get(timeout=60) for _ in filhos]
+        for filho in filhos:
+            filho.join(timeout=60)
+        self.assertEqual(sum(aceitas), capacidade)
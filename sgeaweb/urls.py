@@ -15,14 +15,17 @@ urlpatterns = [
     path("eventos/<int:pk>/editar/", views.evento_update, name="evento_update"),
     path("eventos/<int:pk>/deletar/", views.evento_delete, name="evento_delete"),
     path("eventos/<int:pk>/inscricoes/", views.evento_inscricoes, name="evento_inscricoes"),
+    path("eventos/<int:pk>/inscricoes/certificados.zip", views.evento_certificados_zip, name="evento_certificados_zip"),
     path("eventos/<int:pk>/detalhes/", views.evento_detalhe, name="evento_detalhe"),
     # Inscrições
     path("inscrever/<int:pk_evento>/", views.inscrever, name="inscrever"),
     path("minhas-inscricoes/", views.minhas_inscricoes, name="minhas_inscricoes"),
     # Certificados
     path("certificados/emitir/<int:pk_inscricao>/", views.emitir_certificado, name="emitir_certificado"),
+    path("certificados/verificar/", views.certificado_verificar, name="certificado_verificar"),
     path("certificados/<int:pk_inscricao>/", views.certificado_detalhe, name="certificado_detalhe"),
     path("certificados/<int:pk_inscricao>/pdf/", views.certificado_pdf, name="certificado_pdf"),
     # Auditoria (somente organizadores)
     path("auditoria/", views.auditoria_list, name="auditoria_list"),
+    path("auditoria/exportar/", views.auditoria_exportar, name="auditoria_exportar"),
 ]
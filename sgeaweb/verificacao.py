@@ -0,0 +1,152 @@
+"""Verificação pública de certificados pelo código de validação.
+
+- Resultados positivos ficam no cache do Django (CACHE_PREFIXO + código).
+- Códigos inexistentes são barrados por um filtro de Bloom em memória, que
+  nunca dá falso negativo para os códigos que conhece: um palpite aleatório
+  não chega ao banco.
+- O filtro é reconstruído de forma incremental: certificados emitidos neste
+  processo entram na hora; os emitidos por outros processos (ex.: comando
+  `emitir_certificados`) entram pela marca d'água de ID, consultada no
+  máximo a cada CERTIFICADOS_BLOOM_ATUALIZACAO segundos.
+- O modo em lote resolve todos os códigos restantes num único `IN`.
+"""
+import hashlib
+import math
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Certificado
+
+CACHE_PREFIXO = "cert_verif:"
+CACHE_TTL = 60 * 10
+LOTE_MAXIMO = 500
+# Códigos são gerados por get_random_string (alfanuméricos); o resto nem é consultado
+FORMATO_CODIGO = re.compile(r"^[A-Za-z0-9]{1,64}$")
+
+
+class FiltroBloom:
+    """Filtro de Bloom simples sobre bytearray (k posições derivadas de um blake2b)."""
+
+    def __init__(self, capacidade, taxa_erro=0.001):
+        self.capacidade = capacidade
+        self.bits = max(8, int(-capacidade * math.log(taxa_erro) / (math.log(2) ** 2)))
+        self.k = max(1, round(self.bits / capacidade * math.log(2)))
+        self.dados = bytearray((self.bits + 7) // 8)
+        self.itens = 0
+
+    def _posicoes(self, valor):
+        digest = hashlib.blake2b(valor.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.k))
+
+    def adicionar(self, valor):
+        for pos in self._posicoes(valor):
+            self.dados[pos >> 3] |= 1 << (pos & 7)
+        self.itens += 1
+
+    def __contains__(self, valor):
+        return all(self.dados[pos >> 3] & (1 << (pos & 7)) for pos in self._posicoes(valor))
+
+
+class _IndiceCodigos:
+    """Filtro de Bloom do processo + marca d'água do último certificado incorporado."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filtro = None
+        self._ultimo_id = 0
+        self._atualizado_em = 0.0
+
+    def _reconstruir(self):
+        total = Certificado.objects.count()
+        capacidade = max(getattr(settings, "CERTIFICADOS_BLOOM_CAPACIDADE", 100_000), total * 2)
+        self._filtro = FiltroBloom(capacidade)
+        self._ultimo_id = 0
+        self._incorporar_novos()
+
+    def _incorporar_novos(self):
+        novos = (Certificado.objects
+                 .filter(id__gt=self._ultimo_id)
+                 .order_by("id")
+                 .values_list("id", "codigo_validacao")
+                 .iterator(chunk_size=5000))
+        for pk, codigo in novos:
+            self._filtro.adicionar(codigo)
+            self._ultimo_id = pk
+        self._atualizado_em = time.monotonic()
+
+    def _garantir_atualizado(self):
+        intervalo = getattr(settings, "CERTIFICADOS_BLOOM_ATUALIZACAO", 30)
+        if self._filtro is None or self._filtro.itens > self._filtro.capacidade:
+            self._reconstruir()
+        elif time.monotonic() - self._atualizado_em > intervalo:
+            self._incorporar_novos()
+
+    def registrar(self, codigos):
+        with self._lock:
+            if self._filtro is not None:
+                for codigo in codigos:
+                    self._filtro.adicionar(codigo)
+
+    def talvez_existe(self, codigos):
+        with self._lock:
+            self._garantir_atualizado()
+            return [c for c in codigos if c in self._filtro]
+
+
+indice = _IndiceCodigos()
+
+
+def registrar(codigos):
+    """Informa ao filtro os códigos emitidos neste processo."""
+    indice.registrar(codigos)
+
+
+def esquecer(codigos):
+    """Remove do cache positivo (dados do participante ou do evento mudaram)."""
+    cache.delete_many([CACHE_PREFIXO + c for c in codigos])
+
+
+def _dados_publicos(cert):
+    insc = cert.inscricao
+    ev = insc.evento
+    return {
+        "valido": True,
+        "codigo": cert.codigo_validacao,
+        "participante": insc.participante.get_full_name() or insc.participante.username,
+        "evento": ev.titulo,
+        "data_inicio": ev.data_inicio,
+        "data_fim": ev.data_fim,
+        "emitido_em": cert.emitido_em,
+    }
+
+
+def verificar(codigos):
+    """Verifica vários códigos; devolve {código: dados públicos ou None}."""
+    codigos = list(dict.fromkeys(c.strip() for c in codigos if c and c.strip()))
+    resultado = dict.fromkeys(codigos)
+
+    em_cache = cache.get_many([CACHE_PREFIXO + c for c in codigos if FORMATO_CODIGO.match(c)])
+    for chave, dados in em_cache.items():
+        resultado[chave[len(CACHE_PREFIXO):]] = dados
+
+    candidatos = [c for c in codigos if resultado[c] is None and FORMATO_CODIGO.match(c)]
+    pendentes = indice.talvez_existe(candidatos) if candidatos else []
+    if pendentes:
+        certs = (Certificado.objects
+                 .filter(codigo_validacao__in=pendentes)
+                 .select_related("inscricao__participante", "inscricao__evento"))
+        novos = {cert.codigo_validacao: _dados_publicos(cert) for cert in certs}
+        cache.set_many({CACHE_PREFIXO + c: d for c, d in novos.items()}, CACHE_TTL)
+        resultado.update(novos)
+
+    return resultado
+
+
+def verificar_um(codigo):
+    return verificar([codigo]).get(codigo.strip())
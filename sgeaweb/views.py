@@ -5,30 +5,30 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.utils.crypto import get_random_string
 from django.utils import timezone
 from django.contrib.auth.models import User
-from django.http import HttpResponse, HttpResponseForbidden
-from django.core.mail import EmailMultiAlternatives
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, FileResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.template.loader import render_to_string
 from django.templatetags.static import static
 from django.conf import settings
 
-from io import BytesIO
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-
-from .models import Evento, Inscricao, Certificado, PerfilUsuario, Auditoria
+from datetime import date
+
+from .models import Evento, Inscricao, Certificado, PerfilUsuario, Auditoria, AcaoAuditoria
+from .auditoria import log_action, estatisticas as estatisticas_auditoria
+from .auditoria import consultar as consultar_auditoria, pagina as pagina_auditoria
+from .auditoria import pagina_do_dia as pagina_auditoria_do_dia
+from .auditoria import exportar_linhas as exportar_auditoria, FORMATOS_EXPORTACAO
+from .caixa_saida import enfileirar
+from .cursores import links as links_cursor
+from .cache_paginas import cache_anonimo, fragmento, estatisticas as estatisticas_cache
+from .busca import buscar as buscar_eventos
+from .papeis import papel
+from .eventos import vitrine, pagina as pagina_eventos, TAMANHO_BUSCA
 from .forms import UserRegisterForm, PerfilUsuarioForm, EventoForm
-
-
-#Auditoria
-def log_action(user, acao: str, descricao: str):
-    try:
-        Auditoria.objects.create(usuario=user if user.is_authenticated else None,
-                                 acao=acao,
-                                 descricao=descricao)
-    except Exception:
-        # Evita quebrar fluxo em caso de erro de log
-        pass
+from .pdf import obter_pdf, zip_certificados_do_evento, TEMPLATE_VERSAO as PDF_TEMPLATE_VERSAO
+from .verificacao import verificar_um
+from .reservas import reservar_vaga, validar_inscricao, InscricaoRecusada, DUPLICADA
 
 
 #Envio de e-mail de confirmação
@@ -47,15 +47,40 @@ def enviar_email_confirmacao(usuario, token):
     }
 
     html = render_to_string("email/confirmacao.html", contexto)
-    email = EmailMultiAlternatives(assunto, "", remetente, destinatario)
-    email.attach_alternative(html, "text/html")
-    email.send()
+    # Só enfileira: o comando `enviar_emails` entrega (sgeaweb/caixa_saida.py)
+    enfileirar(assunto, destinatario, html=html, remetente=remetente)
 
 
 # Home
+@cache_anonimo("vitrine", parametros=("todos", "cursor", "q"))
 def home(request):
-    eventos = Evento.objects.all().order_by("data_inicio")
-    return render(request, "sgeaweb/home.html", {"eventos": eventos})
+    todos = request.GET.get("todos") == "1"
+    cursor = request.GET.get("cursor")
+    q = request.GET.get("q", "").strip()
+    perfil = papel(request.user).perfil
+
+    def gerar():
+        nonlocal cursor
+        if q:
+            # Resultado da busca vem por relevância, numa página só
+            eventos = buscar_eventos(vitrine(todos=todos), q)[:TAMANHO_BUSCA]
+            return render_to_string("sgeaweb/evento/cards.html",
+                                    {"eventos": eventos, "perfil": perfil, "q": q}, request)
+        try:
+            eventos, proximo = pagina_eventos(vitrine(todos=todos), cursor)
+        except ValueError:
+            cursor = None
+            eventos, proximo = pagina_eventos(vitrine(todos=todos))
+
+        # Links só com os parâmetros que a página usa (a página em cache é a mesma para qualquer outro)
+        proxima_url, primeira_url = links_cursor({"todos": "1"} if todos else {}, proximo, cursor)
+
+        return render_to_string("sgeaweb/evento/cards.html",
+                                {"eventos": eventos, "perfil": perfil,
+                                 "proxima_url": proxima_url, "primeira_url": primeira_url}, request)
+
+    lista = fragmento("home_eventos", ["vitrine"], [perfil, todos, cursor, q, timezone.localdate()], gerar)
+    return render(request, "sgeaweb/home.html", {"lista_eventos": lista, "todos": todos, "q": q})
 
 
 #Autenticação
@@ -68,13 +93,13 @@ def login_view(request):
             password=request.POST.get("password")
         )
         if user:
-            if not user.perfil.email_confirmado:
+            if not papel(user).email_confirmado:
                 messages.error(request, "Confirme seu e-mail antes de entrar.")
                 return redirect("login")
 
             login(request, user)
             messages.success(request, "Login realizado com sucesso.")
-            log_action(user, "LOGIN", "Usuário realizou login no sistema.")
+            log_action(user, AcaoAuditoria.LOGIN, "Usuário realizou login no sistema.")
             return redirect(next_url or "home")
 
         messages.error(request, "Credenciais inválidas.")
@@ -83,7 +108,7 @@ def login_view(request):
 
 
 def logout_view(request):
-    log_action(request.user, "LOGOUT", "Usuário saiu do sistema.")
+    log_action(request.user, AcaoAuditoria.LOGOUT, "Usuário saiu do sistema.")
     logout(request)
     messages.info(request, "Você saiu do sistema.")
     return redirect("home")
@@ -105,7 +130,8 @@ def cadastro_view(request):
             perfil.confirma_token = get_random_string(48)
             perfil.save()
 
-            log_action(user, "CRIAR_USUARIO", f"Novo usuário criado: {user.username} ({perfil.perfil}).")
+            log_action(user, AcaoAuditoria.CRIAR_USUARIO, f"Novo usuário criado: {user.username} ({perfil.perfil}).",
+                       duravel=True, alvo=user, dados={"perfil": perfil.perfil})
 
             enviar_email_confirmacao(user, perfil.confirma_token)
             messages.success(request, "Cadastro realizado! Verifique seu e-mail para confirmar sua conta.")
@@ -124,17 +150,16 @@ def confirmar_email(request, token):
     perfil.email_confirmado = True
     perfil.confirma_token = None
     perfil.save()
-    log_action(perfil.user, "CONFIRMAR_EMAIL", f"E-mail confirmado para {perfil.user.username}.")
+    log_action(perfil.user, AcaoAuditoria.CONFIRMAR_EMAIL, f"E-mail confirmado para {perfil.user.username}.",
+               duravel=True, alvo=perfil.user)
     messages.success(request, "E-mail confirmado! Agora você pode acessar sua conta.")
     return redirect("login")
 
 
 #Permissão Organizador
 def is_organizador(user: User) -> bool:
-    try:
-        return user.perfil.perfil == "ORGANIZADOR" and user.perfil.email_confirmado
-    except PerfilUsuario.DoesNotExist:
-        return False
+    atual = papel(user)
+    return atual.organizador and atual.email_confirmado
 
 
 #Eventos
@@ -153,7 +178,8 @@ def evento_create(request):
             ev.organizador = request.user
             ev.responsavel = form.cleaned_data["responsavel"]
             ev.save()
-            log_action(request.user, "CADASTRAR_EVENTO", f"Evento criado: {ev.titulo} (ID {ev.id}).")
+            log_action(request.user, AcaoAuditoria.CADASTRAR_EVENTO, f"Evento criado: {ev.titulo} (ID {ev.id}).",
+                       duravel=True, alvo=ev)
             messages.success(request, "Evento criado com sucesso.")
             return redirect("evento_list")
         messages.error(request, "Não foi possível salvar o evento.")
@@ -175,7 +201,8 @@ def evento_update(request, pk):
             ev = form.save(commit=False)
             ev.responsavel = form.cleaned_data["responsavel"]
             ev.save()
-            log_action(request.user, "ALTERAR_EVENTO", f"Evento alterado: {ev.titulo} (ID {ev.id}).")
+            log_action(request.user, AcaoAuditoria.ALTERAR_EVENTO, f"Evento alterado: {ev.titulo} (ID {ev.id}).",
+                       duravel=True, alvo=ev)
             messages.success(request, "Evento atualizado.")
             return redirect("evento_list")
         messages.error(request, "Erro ao atualizar evento.")
@@ -195,16 +222,24 @@ def evento_delete(request, pk):
         titulo = ev.titulo
         _id = ev.id
         ev.delete()
-        log_action(request.user, "EXCLUIR_EVENTO", f"Evento excluído: {titulo} (ID {_id}).")
+        log_action(request.user, AcaoAuditoria.EXCLUIR_EVENTO, f"Evento excluído: {titulo} (ID {_id}).",
+                   duravel=True, alvo=Evento(pk=_id), dados={"titulo": titulo})
         messages.success(request, "Evento excluído.")
         return redirect("evento_list")
 
     return render(request, "sgeaweb/evento/deletar.html", {"evento": ev})
 
 
+@cache_anonimo("evento:{pk}", "cadastros")
 def evento_detalhe(request, pk):
-    evento = get_object_or_404(Evento, pk=pk)
-    return render(request, "sgeaweb/evento/detalhe.html", {"evento": evento})
+    perfil = papel(request.user).perfil
+
+    def gerar():
+        evento = get_object_or_404(Evento.objects.select_related("TIPO", "responsavel"), pk=pk)
+        return render_to_string("sgeaweb/evento/painel.html", {"evento": evento, "perfil": perfil}, request)
+
+    painel = fragmento("evento_painel", [f"evento:{pk}", "cadastros"], [perfil], gerar)
+    return render(request, "sgeaweb/evento/detalhe.html", {"painel": painel})
 
 
 #  Inscrições
@@ -222,30 +257,39 @@ def evento_inscricoes(request, pk):
     return render(request, "sgeaweb/evento/inscricoes.html", {"evento": ev, "inscritos": inscritos})
 
 
-
 @login_required
-def inscrever(request, pk_evento):
-    evento = get_object_or_404(Evento, pk=pk_evento)
+def evento_certificados_zip(request, pk):
+    ev = get_object_or_404(Evento, pk=pk)
 
-    if evento.data_fim < timezone.now().date():
-        messages.error(request, "Este evento já foi encerrado.")
-        return redirect("home")
+    if ev.organizador != request.user:
+        return HttpResponseForbidden("Não autorizado.")
 
-    if request.user == evento.organizador:
-        messages.error(request, "Organizadores não podem se inscrever.")
-        return redirect("home")
+    resp = StreamingHttpResponse(zip_certificados_do_evento(ev.id), content_type="application/zip")
+    resp["Content-Disposition"] = f'attachment; filename="certificados_evento_{ev.id}.zip"'
+    log_action(request.user, AcaoAuditoria.EXPORTAR_CERTIFICADOS_ZIP,
+               f"Exportação em lote dos certificados do evento ID {ev.id} - {ev.titulo}.", alvo=ev)
+    return resp
 
-    if Inscricao.objects.filter(evento=evento, participante=request.user).exists():
-        messages.info(request, "Você já está inscrito.")
-        return redirect("minhas_inscricoes")
 
-    if Inscricao.objects.filter(evento=evento).count() >= evento.vagas:
-        messages.error(request, "Vagas esgotadas.")
+@login_required
+def inscrever(request, pk_evento):
+    evento = get_object_or_404(Evento, pk=pk_evento)
+
+    try:
+        if request.method == "POST":
+            reservar_vaga(evento, request.user)
+        else:
+            validar_inscricao(evento, request.user)
+    except InscricaoRecusada as e:
+        if e.codigo == DUPLICADA:
+            messages.info(request, "Você já está inscrito.")
+            return redirect("minhas_inscricoes")
+        messages.error(request, e.mensagem)
         return redirect("home")
 
     if request.method == "POST":
-        insc = Inscricao.objects.create(participante=request.user, evento=evento)
-        log_action(request.user, "INSCRICAO_EVENTO", f"Inscrição no evento ID {evento.id} - {evento.titulo}.")
+        log_action(request.user, AcaoAuditoria.INSCRICAO_EVENTO, f"Inscrição no evento ID {evento.id} - {evento.titulo}.",
+                   duravel=True, alvo=evento)
         messages.success(request, "Inscrição realizada.")
         return redirect("minhas_inscricoes")
 
@@ -255,24 +299,11 @@ def inscrever(request, pk_evento):
 #Minhas inscrições 
 @login_required
 def minhas_inscricoes(request):
+    # Somente leitura: a emissão automática acontece ao confirmar presença,
+    # ao encerrar o evento (signals) ou pelo comando emitir_certificados.
     insc = (Inscricao.objects
             .filter(participante=request.user)
-            .select_related("evento"))
-
-    # Emissão automática de certificados 
-    hoje = timezone.now().date()
-    for i in insc:
-        if i.evento.data_fim <= hoje and i.presenca_confirmada:
-            cert, created = Certificado.objects.get_or_create(
-                inscricao=i,
-                defaults={"codigo_validacao": get_random_string(16)}
-            )
-            if created:
-                log_action(request.user, "GERAR_CERTIFICADO",
-                          f"Certificado autoemitido para inscrição {i.id} (evento {i.evento.id}).")
-
-        # anexa para facilitar o template
-        i.certificado = getattr(i, "certificado", None) or Certificado.objects.filter(inscricao=i).first()
+            .select_related("evento", "certificado"))
 
     return render(request, "sgeaweb/inscricao/minhas.html", {"inscricoes": insc})
 
@@ -291,8 +322,9 @@ def emitir_certificado(request, pk_inscricao):
 
     if created:
         messages.success(request, f"Certificado emitido! Código: {cert.codigo_validacao}")
-        log_action(request.user, "GERAR_CERTIFICADO",
-                  f"Certificado emitido manualmente para inscrição {insc.id}.")
+        log_action(request.user, AcaoAuditoria.GERAR_CERTIFICADO,
+                  f"Certificado emitido manualmente para inscrição {insc.id}.", duravel=True,
+                  alvo=insc, dados={"evento": insc.evento_id, "codigo": cert.codigo_validacao})
     else:
         messages.info(request, "Este certificado já existia.")
 
@@ -306,73 +338,101 @@ def certificado_detalhe(request, pk_inscricao):
         return HttpResponseForbidden("Não autorizado.")
 
     cert = get_object_or_404(Certificado, inscricao=insc)
-    log_action(request.user, "CONSULTAR_CERTIFICADO",
-               f"Usuário consultou certificado (inscrição {insc.id}).")
+    log_action(request.user, AcaoAuditoria.CONSULTAR_CERTIFICADO,
+               f"Usuário consultou certificado (inscrição {insc.id}).", alvo=insc)
     return render(request, "sgeaweb/certificado/detalhe.html", {"inscricao": insc, "certificado": cert})
 
 
 @login_required
 def certificado_pdf(request, pk_inscricao):
-    insc = get_object_or_404(Inscricao, pk=pk_inscricao)
+    insc = get_object_or_404(Inscricao.objects.select_related("participante", "evento"), pk=pk_inscricao)
     if insc.participante != request.user:
         return HttpResponseForbidden("Não autorizado.")
 
     cert = get_object_or_404(Certificado, inscricao=insc)
-    aluno = request.user.get_full_name() or request.user.username
-    evento = insc.evento
-
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=A4)
-    w, h = A4
+    cert.inscricao = insc
+    caminho = obter_pdf(cert)
+
+    # Conditional GET: o PDF só muda quando o cache é invalidado (novo mtime)
+    mtime = caminho.stat().st_mtime
+    etag = f'"{cert.codigo_validacao}-v{PDF_TEMPLATE_VERSAO}-{int(mtime)}"'
+    nao_modificado = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+    if nao_modificado is not None:
+        return nao_modificado
+
+    resp = FileResponse(open(caminho, "rb"), as_attachment=True,
+                        filename=f"certificado_{cert.codigo_validacao}.pdf",
+                        content_type="application/pdf")
+    resp["ETag"] = etag
+    resp["Last-Modified"] = http_date(mtime)
+    resp["Cache-Control"] = "private, no-cache"
+    log_action(request.user, AcaoAuditoria.BAIXAR_CERTIFICADO_PDF,
+               f"Usuário baixou PDF do certificado (inscrição {insc.id}).", alvo=insc)
+    return resp
 
-    p.setFont("Helvetica-Bold", 20)
-    p.drawCentredString(w / 2, h - 3 * cm, "CERTIFICADO DE PARTICIPAÇÃO")
 
-    p.setFont("Helvetica", 12)
-    texto = (
-        f"Certificamos que {aluno} participou do evento '{evento.titulo}', "
-        f"realizado em {evento.data_inicio.strftime('%d/%m/%Y')}"
-    )
-    if evento.data_fim != evento.data_inicio:
-        texto += f" a {evento.data_fim.strftime('%d/%m/%Y')}"
-    texto += f", no local {evento.local}."
-    p.drawString(2.5 * cm, h - 5 * cm, texto)
-
-    p.setFont("Helvetica", 11)
-    p.drawString(2.5 * cm, h - 7 * cm, f"Código de validação: {cert.codigo_validacao}")
-    p.setFont("Helvetica-Oblique", 9)
-    p.drawString(2.5 * cm, 2.2 * cm, f"Emitido em {cert.emitido_em.strftime('%d/%m/%Y %H:%M')} — SGEA")
-
-    p.showPage()
-    p.save()
-
-    pdf = buffer.getvalue()
-    buffer.close()
-
-    resp = HttpResponse(pdf, content_type="application/pdf")
-    resp["Content-Disposition"] = f'attachment; filename="certificado_{cert.codigo_validacao}.pdf"'
-    log_action(request.user, "BAIXAR_CERTIFICADO_PDF",
-               f"Usuário baixou PDF do certificado (inscrição {insc.id}).")
-    return resp
+def certificado_verificar(request):
+    """Verificação pública de um código de validação (sem login)."""
+    codigo = request.GET.get("codigo", "").strip()
+    resultado = verificar_um(codigo) if codigo else None
+    return render(request, "sgeaweb/certificado/verificar.html",
+                  {"codigo": codigo, "resultado": resultado})
 
 
 # Tela do Organizador
 @user_passes_test(is_organizador)
 def auditoria_list(request):
-    qs = Auditoria.objects.all().select_related("usuario")
     # filtros simples por data e usuário
     dia = request.GET.get("dia")  # formato YYYY-MM-DD
-    usuario = request.GET.get("usuario")  # username
+    usuario = request.GET.get("usuario", "").strip()  # username
+    cursor = request.GET.get("cursor")
 
+    data = None
     if dia:
         try:
-            d = timezone.datetime.fromisoformat(dia).date()
-            qs = qs.filter(data_hora__date=d)
-        except Exception:
+            data = date.fromisoformat(dia)
+        except ValueError:
             messages.error(request, "Data inválida no filtro (use YYYY-MM-DD).")
 
-    if usuario:
-        qs = qs.filter(usuario__username__icontains=usuario)
+    try:
+        if data:
+            # Dias antigos podem já ter sido movidos para o arquivo mensal
+            registros, proximo = pagina_auditoria_do_dia(data, usuario, cursor)
+        else:
+            registros, proximo = pagina_auditoria(
+                consultar_auditoria(usuario=usuario).select_related("usuario"), cursor)
+    except ValueError:
+        messages.error(request, "Página inválida; voltando ao início.")
+        cursor = None
+        if data:
+            registros, proximo = pagina_auditoria_do_dia(data, usuario, None)
+        else:
+            registros, proximo = pagina_auditoria(
+                consultar_auditoria(usuario=usuario).select_related("usuario"))
+
+    proxima_url, primeira_url = links_cursor(request.GET, proximo, cursor)
+
+    return render(request, "sgeaweb/auditoria/listar.html",
+                  {"registros": registros, "proxima_url": proxima_url, "primeira_url": primeira_url,
+                   "fila": estatisticas_auditoria(), "cache_paginas": estatisticas_cache()})
+
 
-    qs = qs.order_by("-data_hora")[:500]  # limite de segurança
-    return render(request, "sgeaweb/auditoria/listar.html", {"registros": qs})
+@user_passes_test(is_organizador)
+def auditoria_exportar(request):
+    formato = request.GET.get("formato", "csv")
+    if formato not in FORMATOS_EXPORTACAO:
+        return HttpResponseBadRequest("Formato inválido (use csv ou jsonl).")
+
+    try:
+        filtros = {campo: date.fromisoformat(request.GET[campo])
+                   for campo in ("dia", "desde", "ate") if request.GET.get(campo)}
+    except ValueError:
+        return HttpResponseBadRequest("Data inválida no filtro (use YYYY-MM-DD).")
+
+    qs = consultar_auditoria(usuario=request.GET.get("usuario", "").strip(), **filtros)
+    resp = StreamingHttpResponse(exportar_auditoria(qs, formato), content_type=FORMATOS_EXPORTACAO[formato])
+    resp["Content-Disposition"] = f'attachment; filename="auditoria.{formato}"'
+    log_action(request.user, AcaoAuditoria.EXPORTAR_AUDITORIA,
+               f"Exportação da auditoria ({formato}) com filtros {request.GET.urlencode() or '(nenhum)'}.",
+               duravel=True, dados=request.GET.dict())
+    return resp